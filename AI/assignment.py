@@ -49,5 +49,6 @@ def layout(N, C, L):
     else:
         return False  # No valid arrangement is possible
 # Example usage
-print(layout(4, 2, [(0, 1), (1, 2), (2, 3)]))
+if __name__ == "__main__":
+    print(layout(4, 2, [(0, 1), (1, 2), (2, 3)]))
 # Expected output:
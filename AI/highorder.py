@@ -1,11 +1,124 @@
-def count(predicate, lst):
-# Initialize count of elements satisfying the predicate
- result = 0
-# Traverse the list manually
- for x in lst:
-  if predicate(x): # Apply the test
-   result += 1 # Increment count if test is true
- return result # Return the final count
+# Small higher-order toolkit: count, filter, map and reduce
+#
+# Each helper works on plain lists, lazy iterators (which are consumed one
+# chunk at a time and never materialized), and NumPy arrays. With
+# vectorized=True a NumPy array is passed to the function as a whole, so the
+# predicate or mapping runs as array operations instead of once per element.
+# With processes=N the input is cut into chunks that are handled by a process
+# pool; the function must then be picklable (a module-level def, not a lambda).
+import builtins
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy support is optional
+    np = None
+
+CHUNK_SIZE = 100000
+_MISSING = object()
+
+def _is_array(seq):
+    return np is not None and isinstance(seq, np.ndarray)
+
+# Split any iterable into lists (or array slices) of at most `size` elements, lazily
+def _chunks(seq, size):
+    if _is_array(seq):
+        for start in range(0, len(seq), size):
+            yield seq[start:start + size]
+        return
+    it = iter(seq)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Apply fn to every chunk in a process pool, yielding results in input order
+# while keeping only a few chunks in flight
+def _parallel(fn, chunks, processes):
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+def _count_chunk(predicate, chunk):
+    # Initialize count of elements satisfying the predicate
+    result = 0
+    # Traverse the chunk manually
+    for x in chunk:
+        if predicate(x):  # Apply the test
+            result += 1  # Increment count if test is true
+    return result  # Return the final count
+
+def _filter_chunk(predicate, chunk):
+    return [x for x in chunk if predicate(x)]
+
+def _map_chunk(fn, chunk):
+    return [fn(x) for x in chunk]
+
+def _reduce_chunk(fn, chunk):
+    return functools.reduce(fn, chunk)
+
+def count(predicate, lst, vectorized=False, processes=None, chunk_size=CHUNK_SIZE):
+    if vectorized and _is_array(lst):
+        # predicate(array) returns a boolean array
+        return int(np.count_nonzero(predicate(lst)))
+    if processes:
+        work = functools.partial(_count_chunk, predicate)
+        return sum(_parallel(work, _chunks(lst, chunk_size), processes))
+    return _count_chunk(predicate, lst)
+
+def filter(predicate, lst, vectorized=False, processes=None, chunk_size=CHUNK_SIZE):
+    # Returns a filtered array for vectorized NumPy input, otherwise a lazy iterator
+    if vectorized and _is_array(lst):
+        return lst[predicate(lst)]
+    if processes:
+        work = functools.partial(_filter_chunk, predicate)
+        return (x for part in _parallel(work, _chunks(lst, chunk_size), processes) for x in part)
+    return builtins.filter(predicate, lst)
+
+def map(fn, lst, vectorized=False, processes=None, chunk_size=CHUNK_SIZE):
+    # Returns fn(array) for vectorized NumPy input, otherwise a lazy iterator
+    if vectorized and _is_array(lst):
+        return fn(lst)
+    if processes:
+        work = functools.partial(_map_chunk, fn)
+        return (x for part in _parallel(work, _chunks(lst, chunk_size), processes) for x in part)
+    return builtins.map(fn, lst)
+
+def reduce(fn, lst, initial=_MISSING, processes=None, chunk_size=CHUNK_SIZE):
+    # NumPy ufuncs (np.add, np.maximum, ...) reduce a whole array in one call
+    if _is_array(lst) and isinstance(fn, np.ufunc):
+        result = fn.reduce(lst)
+        return result if initial is _MISSING else fn(initial, result)
+    if processes:
+        # Chunks are reduced independently and the partial results combined,
+        # so fn must be associative
+        work = functools.partial(_reduce_chunk, fn)
+        parts = _parallel(work, _chunks(lst, chunk_size), processes)
+    else:
+        parts = lst
+    if initial is _MISSING:
+        return functools.reduce(fn, parts)
+    return functools.reduce(fn, parts, initial)
+
+def _greater_than_two(x):
+    return x > 2
+
 # Example usage
-print(count(lambda x: x > 2, [1, 2, 3, 4, 5])) # Output: 3
-print(count(lambda x: x % 2 == 0, [1, 3, 4, 6])) # Output: 2
\ No newline at end of file
+if __name__ == "__main__":
+    print(count(lambda x: x > 2, [1, 2, 3, 4, 5]))  # Output: 3
+    print(count(lambda x: x % 2 == 0, [1, 3, 4, 6]))  # Output: 2
+    print(list(filter(lambda x: x % 2, range(10))))  # Output: [1, 3, 5, 7, 9]
+    print(reduce(lambda a, b: a + b, map(lambda x: x * x, range(5))))  # Output: 30
+    print(count(_greater_than_two, range(1000000), processes=2))  # Output: 999997
+    if np is not None:
+        data = np.arange(1000000)
+        print(count(lambda a: a % 3 == 0, data, vectorized=True))  # Output: 333334
+        print(reduce(np.add, data))  # Output: 499999500000
@@ -1,7 +1,11 @@
 # A Huffman Tree Node
 import heapq
+import io
+import struct
+from collections import Counter
+
 class node:
- def _init_(self, freq, symbol, left=None, right=None):
+ def __init__(self, freq, symbol, left=None, right=None):
     # frequency of symbol
     self.freq = freq
     # symbol name (character)
@@ -12,7 +16,7 @@ class node:
     self.right = right
     # tree direction (0/1)
     self.huff = ''
- def _lt_(self, nxt):
+ def __lt__(self, nxt):
     return self.freq < nxt.freq
 # utility function to print huffman
 # codes for all symbols in the newly
@@ -30,27 +34,335 @@ def printNodes(node, val=''):
     # display its huffman code
     if(not node.left and not node.right):
      print(f"{node.symbol} -> {newVal}")
-# characters for huffman tree
-chars = ['a', 'b', 'c', 'd', 'e', 'f']
-# frequency of characters
-freq = [ 5, 9, 12, 13, 16, 45]
-# list containing unused nodes
-nodes = []
-# converting characters and frequencies
-# into huffman tree nodes
-for x in range(len(chars)):
-    heapq.heappush(nodes, node(freq[x], chars[x]))
-while len(nodes) > 1:
-    # sort all the nodes in ascending order
-    # based on their frequency
-    left = heapq.heappop(nodes)
-    right = heapq.heappop(nodes)
-    # assign directional value to these nodes
-    left.huff = 0
-    right.huff = 1
-    # combine the 2 smallest nodes to create
-    # new node as their parent
-    newNode = node(left.freq+right.freq, left.symbol+right.symbol, left, right)
-    heapq.heappush(nodes, newNode)
-    # Huffman Tree is ready!
-printNodes(nodes[0])
\ No newline at end of file
+
+# ----------------- Byte-stream coder with canonical codes -----------------
+# Compressed stream layout:
+#   magic "HUF1" | original length (uint64) | number of symbols (uint16)
+#   | (symbol, code length) byte pairs | bit stream, padded with 0s to a whole byte
+MAGIC = b'HUF1'
+HEADER = struct.Struct('>4sQH')
+CHUNK_SIZE = 1 << 20
+MAX_CODE_LENGTH = 16
+
+# Count how often each byte value occurs; pass `freq` to keep counting across chunks
+def frequency_table(data, freq=None):
+    if freq is None:
+        freq = [0] * 256
+    for symbol, count in Counter(data).items():
+        freq[symbol] += count
+    return freq
+
+# Build the Huffman tree for a frequency table and return each symbol's code length,
+# limited to max_len bits so the decoder tables stay small for skewed inputs
+def code_lengths(freq, max_len=MAX_CODE_LENGTH):
+    nodes = []
+    for symbol in range(256):
+        if freq[symbol]:
+            heapq.heappush(nodes, node(freq[symbol], symbol))
+    lengths = [0] * 256
+    if len(nodes) == 1:
+        # A single symbol still needs a 1-bit code
+        lengths[nodes[0].symbol] = 1
+        return lengths
+    while len(nodes) > 1:
+        left = heapq.heappop(nodes)
+        right = heapq.heappop(nodes)
+        heapq.heappush(nodes, node(left.freq + right.freq, None, left, right))
+    # Depth of each leaf is its code length
+    stack = [(nodes[0], 0)] if nodes else []
+    while stack:
+        current, depth = stack.pop()
+        if current.left is None:
+            lengths[current.symbol] = depth
+        else:
+            stack.append((current.left, depth + 1))
+            stack.append((current.right, depth + 1))
+    if max(lengths) > max_len:
+        lengths = _limit_lengths(freq, lengths, max_len)
+    return lengths
+
+# Shorten codes longer than max_len (the rebalancing of JPEG Annex K.3): take two
+# leaves from the deepest level, put one of them under the other's parent and
+# split a shorter leaf in two to hold the second. The code stays complete and
+# the most frequent symbols still get the shortest codes
+def _limit_lengths(freq, lengths, max_len):
+    count = [0] * (max(lengths) + 1)
+    for l in lengths:
+        if l:
+            count[l] += 1
+    for i in range(len(count) - 1, max_len, -1):
+        while count[i]:
+            j = i - 2
+            while not count[j]:
+                j -= 1
+            count[i] -= 2
+            count[i - 1] += 1
+            count[j + 1] += 2
+            count[j] -= 1
+    # Hand the new lengths out shortest first, most frequent symbol first
+    order = sorted((s for s in range(256) if lengths[s]), key=lambda s: (-freq[s], lengths[s], s))
+    limited = [0] * 256
+    l = 1
+    for symbol in order:
+        while not count[l]:
+            l += 1
+        limited[symbol] = l
+        count[l] -= 1
+    return limited
+
+# Canonical codes: sort symbols by (length, symbol) and count upwards, so the
+# code lengths alone are enough for the decoder to rebuild every code
+def canonical_codes(lengths):
+    codes = {}
+    code = 0
+    prev_len = 0
+    for length, symbol in sorted((l, s) for s, l in enumerate(lengths) if l):
+        code <<= length - prev_len
+        codes[symbol] = (code, length)
+        code += 1
+        prev_len = length
+    return codes
+
+def write_header(out, lengths, original_length):
+    symbols = [(s, l) for s, l in enumerate(lengths) if l]
+    out.write(HEADER.pack(MAGIC, original_length, len(symbols)))
+    out.write(bytes(b for pair in symbols for b in pair))
+
+def read_header(inp):
+    magic, original_length, count = HEADER.unpack(inp.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a Huffman-compressed stream")
+    pairs = inp.read(2 * count)
+    lengths = [0] * 256
+    for i in range(0, len(pairs), 2):
+        lengths[pairs[i]] = pairs[i + 1]
+    return lengths, original_length
+
+# Encodes chunks of bytes into whole output bytes, carrying leftover bits between chunks
+class Encoder:
+    def __init__(self, lengths):
+        codes = canonical_codes(lengths)
+        # Code of every byte value as a string of '0'/'1', so a chunk is encoded with one join
+        self.bit_strings = [''] * 256
+        for symbol, (code, length) in codes.items():
+            self.bit_strings[symbol] = format(code, f'0{length}b')
+        self.pending = ''
+
+    def encode(self, chunk):
+        bits = self.pending + ''.join(map(self.bit_strings.__getitem__, chunk))
+        whole = len(bits) - len(bits) % 8
+        self.pending = bits[whole:]
+        return int(bits[:whole], 2).to_bytes(whole // 8, 'big') if whole else b''
+
+    def flush(self):
+        bits, self.pending = self.pending, ''
+        return int(bits.ljust(8, '0'), 2).to_bytes(1, 'big') if bits else b''
+
+# Canonical decoder: reads one bit at a time and compares the code so far
+# with the first code of each length (simple reference; see TableDecoder)
+class Decoder:
+    def __init__(self, lengths):
+        max_len = max(lengths) if any(lengths) else 0
+        self.symbols = [s for l, s in sorted((l, s) for s, l in enumerate(lengths) if l)]
+        self.count = [0] * (max_len + 1)
+        for l in lengths:
+            if l:
+                self.count[l] += 1
+        # first[l] = first code of length l, index[l] = its position in self.symbols
+        self.first = [0] * (max_len + 1)
+        self.index = [0] * (max_len + 1)
+        code = index = 0
+        for l in range(1, max_len + 1):
+            code = (code + self.count[l - 1]) << 1 if l > 1 else 0
+            self.first[l] = code
+            self.index[l] = index
+            index += self.count[l]
+        self.code = 0
+        self.length = 0
+
+    def decode(self, chunk, limit):
+        out = bytearray()
+        code, length = self.code, self.length
+        first, count, index, symbols = self.first, self.count, self.index, self.symbols
+        for byte in chunk:
+            for shift in range(7, -1, -1):
+                code = (code << 1) | ((byte >> shift) & 1)
+                length += 1
+                if code - first[length] < count[length]:
+                    out.append(symbols[index[length] + code - first[length]])
+                    code = length = 0
+                    if len(out) == limit:
+                        self.code = self.length = 0
+                        return bytes(out)
+        self.code, self.length = code, length
+        return bytes(out)
+
+# Table-driven decoder: looks up `primary_bits` bits at a time in a primary
+# table; codes longer than that continue in a subtable for their prefix, of at
+# most 2^(MAX_CODE_LENGTH - primary_bits) entries since code_lengths limits codes
+class TableDecoder:
+    def __init__(self, lengths, primary_bits=10):
+        codes = canonical_codes(lengths)
+        self.max_len = max(lengths) if codes else 0
+        k = self.primary_bits = min(primary_bits, self.max_len)
+        # Primary entry: (symbol, length) for short codes, (subtable id, 0) for
+        # prefixes of long codes, (0, -1) for bit patterns that are not a code
+        self.primary_sym = [0] * (1 << k)
+        self.primary_len = [-1] * (1 << k)
+        self.sub_bits = []
+        self.sub_sym = []
+        self.sub_len = []
+        long_codes = {}
+        for symbol, (code, length) in codes.items():
+            if length <= k:
+                # Every index starting with this code decodes to the symbol
+                start = code << (k - length)
+                for idx in range(start, start + (1 << (k - length))):
+                    self.primary_sym[idx] = symbol
+                    self.primary_len[idx] = length
+            else:
+                long_codes.setdefault(code >> (length - k), []).append((symbol, code, length))
+        for prefix, entries in long_codes.items():
+            bits = max(length for _, _, length in entries) - k
+            table_sym = [0] * (1 << bits)
+            table_len = [-1] * (1 << bits)
+            for symbol, code, length in entries:
+                rest = code & ((1 << (length - k)) - 1)
+                start = rest << (bits - (length - k))
+                for idx in range(start, start + (1 << (bits - (length - k)))):
+                    table_sym[idx] = symbol
+                    table_len[idx] = length
+            self.primary_sym[prefix] = len(self.sub_bits)
+            self.primary_len[prefix] = 0
+            self.sub_bits.append(bits)
+            self.sub_sym.append(table_sym)
+            self.sub_len.append(table_len)
+        # Bit buffer carried between chunks
+        self.acc = 0
+        self.nbits = 0
+
+    def decode(self, chunk, limit):
+        out = bytearray()
+        append = out.append
+        acc, nbits = self.acc, self.nbits
+        need, k = self.max_len, self.primary_bits
+        need_mask = (1 << need) - 1
+        sub_shift = need - k
+        primary_sym, primary_len = self.primary_sym, self.primary_len
+        pos, end = 0, len(chunk)
+        left = limit
+        while left:
+            if nbits < need:
+                if pos < end:
+                    # Refill: drop consumed bits and append the next few bytes
+                    take = max(16, (need - nbits + 7) // 8)
+                    piece = chunk[pos:pos + take]
+                    acc = ((acc & ((1 << nbits) - 1)) << (8 * len(piece))) | int.from_bytes(piece, 'big')
+                    nbits += 8 * len(piece)
+                    pos += len(piece)
+                    continue
+                # Out of input: look up with zero padding, accept only if the code is complete
+                peek = (acc << (need - nbits)) & need_mask
+            else:
+                # Next `need` bits of the stream; consumed bits above them are masked off
+                peek = (acc >> (nbits - need)) & need_mask
+            idx = peek >> sub_shift
+            symbol, length = primary_sym[idx], primary_len[idx]
+            if length == 0:
+                bits = self.sub_bits[symbol]
+                sub = (peek >> (sub_shift - bits)) & ((1 << bits) - 1)
+                symbol, length = self.sub_sym[symbol][sub], self.sub_len[symbol][sub]
+            if length < 0:
+                raise ValueError("Invalid code in compressed stream")
+            if length > nbits:
+                break  # Wait for the next chunk
+            append(symbol)
+            nbits -= length
+            left -= 1
+        if not left:
+            acc = nbits = 0  # The rest is padding
+        self.acc, self.nbits = acc & ((1 << nbits) - 1), nbits
+        return bytes(out)
+
+def compress_stream(inp, out, chunk_size=CHUNK_SIZE):
+    # First pass: frequency table
+    freq = [0] * 256
+    original_length = 0
+    while True:
+        chunk = inp.read(chunk_size)
+        if not chunk:
+            break
+        frequency_table(chunk, freq)
+        original_length += len(chunk)
+    lengths = code_lengths(freq)
+    write_header(out, lengths, original_length)
+    # Second pass: encode chunk by chunk
+    inp.seek(0)
+    encoder = Encoder(lengths)
+    while True:
+        chunk = inp.read(chunk_size)
+        if not chunk:
+            break
+        out.write(encoder.encode(chunk))
+    out.write(encoder.flush())
+
+def decompress_stream(inp, out, chunk_size=CHUNK_SIZE, decoder_class=TableDecoder):
+    lengths, remaining = read_header(inp)
+    decoder = decoder_class(lengths)
+    while remaining:
+        chunk = inp.read(chunk_size)
+        if not chunk:
+            raise ValueError("Compressed stream is truncated")
+        data = decoder.decode(chunk, remaining)
+        out.write(data)
+        remaining -= len(data)
+
+def compress_file(src_path, dst_path, chunk_size=CHUNK_SIZE):
+    with open(src_path, 'rb') as inp, open(dst_path, 'wb') as out:
+        compress_stream(inp, out, chunk_size)
+
+def decompress_file(src_path, dst_path, chunk_size=CHUNK_SIZE):
+    with open(src_path, 'rb') as inp, open(dst_path, 'wb') as out:
+        decompress_stream(inp, out, chunk_size)
+
+def compress(data):
+    out = io.BytesIO()
+    compress_stream(io.BytesIO(data), out)
+    return out.getvalue()
+
+def decompress(blob):
+    out = io.BytesIO()
+    decompress_stream(io.BytesIO(blob), out)
+    return out.getvalue()
+
+if __name__ == "__main__":
+    # characters for huffman tree
+    chars = ['a', 'b', 'c', 'd', 'e', 'f']
+    # frequency of characters
+    freq = [ 5, 9, 12, 13, 16, 45]
+    # list containing unused nodes
+    nodes = []
+    # converting characters and frequencies
+    # into huffman tree nodes
+    for x in range(len(chars)):
+        heapq.heappush(nodes, node(freq[x], chars[x]))
+    while len(nodes) > 1:
+        # sort all the nodes in ascending order
+        # based on their frequency
+        left = heapq.heappop(nodes)
+        right = heapq.heappop(nodes)
+        # assign directional value to these nodes
+        left.huff = 0
+        right.huff = 1
+        # combine the 2 smallest nodes to create
+        # new node as their parent
+        newNode = node(left.freq+right.freq, left.symbol+right.symbol, left, right)
+        heapq.heappush(nodes, newNode)
+        # Huffman Tree is ready!
+    printNodes(nodes[0])
+
+    # Round trip of some byte data through the canonical coder
+    data = b"meter 0042 reading 1187.5 kWh\n" * 200
+    packed = compress(data)
+    assert decompress(packed) == data
+    print(f"{len(data)} bytes -> {len(packed)} bytes")
@@ -0,0 +1,200 @@
+# Block-wise parallel Huffman compression for very large files
+#
+# The input file is memory-mapped and split into fixed-size blocks that are
+# compressed independently in a process pool. Each worker maps the file itself,
+# so only block offsets (not data) are sent to the workers.
+#
+# Container layout:
+#   magic "HUFB" | flags (uint8) | block size (uint32) | block count (uint32)
+#   | original length (uint64)
+#   | shared table, if flag SHARED_TABLE: symbol count (uint16) + (symbol, length) pairs
+#   | block index: block count x (payload offset uint64, payload length uint64)
+#   | block payloads
+# With a shared table a payload is the bare bit stream of the block; otherwise
+# it is a complete single-stream file as written by huffman.compress_stream.
+# The index lets any block be decoded on its own, in parallel or at random.
+import io
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from huffman import (Encoder, TableDecoder, code_lengths, compress_stream,
+                     decompress_stream, frequency_table)
+
+MAGIC = b'HUFB'
+HEADER = struct.Struct('>4sBIIQ')
+INDEX_ENTRY = struct.Struct('>QQ')
+SHARED_TABLE = 1
+BLOCK_SIZE = 16 << 20
+
+# Block i covers bytes [i * block_size, min((i + 1) * block_size, length))
+def block_ranges(length, block_size):
+    return [(start, min(start + block_size, length)) for start in range(0, length, block_size)]
+
+# Read one block of a file through a private memory map
+def _read_block(path, start, end):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[start:end]
+
+def _block_frequencies(path, start, end):
+    return frequency_table(_read_block(path, start, end))
+
+def _compress_block(path, start, end, lengths):
+    data = _read_block(path, start, end)
+    if lengths is None:
+        # Own table: the payload is a complete single-stream file
+        out = io.BytesIO()
+        compress_stream(io.BytesIO(data), out)
+        return out.getvalue()
+    encoder = Encoder(lengths)
+    return encoder.encode(data) + encoder.flush()
+
+def _decompress_block(payload, original_length, lengths):
+    if lengths is None:
+        out = io.BytesIO()
+        decompress_stream(io.BytesIO(payload), out)
+        return out.getvalue()
+    # A bare bit stream has no length of its own, so a corrupt or truncated
+    # payload would otherwise just decode short
+    data = TableDecoder(lengths).decode(payload, original_length)
+    if len(data) != original_length:
+        raise ValueError("Compressed block is truncated")
+    return data
+
+def _table_bytes(lengths):
+    pairs = [(s, l) for s, l in enumerate(lengths) if l]
+    return struct.pack('>H', len(pairs)) + bytes(b for pair in pairs for b in pair)
+
+# Run fn over argument tuples in a pool, yielding results in order with a bounded
+# number of blocks in flight so memory use does not grow with the file size
+def _ordered_map(pool, fn, arg_list, window):
+    pending = []
+    for args in arg_list:
+        pending.append(pool.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+def compress_file(src_path, dst_path, block_size=BLOCK_SIZE, shared_table=False, workers=None):
+    length = os.path.getsize(src_path)
+    blocks = block_ranges(length, block_size)
+    flags = SHARED_TABLE if shared_table else 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(dst_path, 'wb') as out:
+        window = 2 * (workers or os.cpu_count() or 1)
+        lengths = None
+        out.write(HEADER.pack(MAGIC, flags, block_size, len(blocks), length))
+        if shared_table:
+            # One table for the whole file, from per-block frequency counts
+            freq = [0] * 256
+            for block_freq in _ordered_map(pool, _block_frequencies,
+                                           [(src_path, s, e) for s, e in blocks], window):
+                for symbol, count in enumerate(block_freq):
+                    freq[symbol] += count
+            lengths = code_lengths(freq)
+            out.write(_table_bytes(lengths))
+
+        # Reserve the index, write payloads as they arrive, then fill the index in
+        index_pos = out.tell()
+        out.write(b'\0' * (INDEX_ENTRY.size * len(blocks)))
+        index = []
+        for payload in _ordered_map(pool, _compress_block,
+                                    [(src_path, s, e, lengths) for s, e in blocks], window):
+            index.append((out.tell(), len(payload)))
+            out.write(payload)
+        out.seek(index_pos)
+        for offset, size in index:
+            out.write(INDEX_ENTRY.pack(offset, size))
+
+# Parsed container header and block index, for decoding single blocks
+class BlockFile:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, flags, self.block_size, count, self.length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a block-compressed Huffman file")
+            self.lengths = None
+            if flags & SHARED_TABLE:
+                (symbols,) = struct.unpack('>H', f.read(2))
+                pairs = f.read(2 * symbols)
+                self.lengths = [0] * 256
+                for i in range(0, len(pairs), 2):
+                    self.lengths[pairs[i]] = pairs[i + 1]
+            self.index = [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size)) for _ in range(count)]
+
+    def __len__(self):
+        return len(self.index)
+
+    def block_length(self, i):
+        return min(self.block_size, self.length - i * self.block_size)
+
+    # Decompress block i only (random access)
+    def read_block(self, i):
+        offset, size = self.index[i]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            payload = f.read(size)
+        return _decompress_block(payload, self.block_length(i), self.lengths)
+
+    # Decompress bytes [start, end) of the original file, touching only the blocks needed
+    def read(self, start, end):
+        end = min(end, self.length)
+        if start >= end:
+            return b''
+        first, last = start // self.block_size, (end - 1) // self.block_size
+        data = b''.join(self.read_block(i) for i in range(first, last + 1))
+        base = first * self.block_size
+        return data[start - base:end - base]
+
+# Decode one block and write it straight to its place in the output file
+def _decompress_block_to(src_path, dst_path, offset, size, original_length, lengths, out_offset):
+    with open(src_path, 'rb') as f:
+        f.seek(offset)
+        payload = f.read(size)
+    data = _decompress_block(payload, original_length, lengths)
+    with open(dst_path, 'r+b') as out:
+        out.seek(out_offset)
+        out.write(data)
+    return len(data)
+
+def decompress_file(src_path, dst_path, workers=None):
+    container = BlockFile(src_path)
+    # Pre-size the output so every worker can write its block in place
+    with open(dst_path, 'wb') as out:
+        out.truncate(container.length)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_decompress_block_to, src_path, dst_path, offset, size,
+                        container.block_length(i), container.lengths, i * container.block_size)
+            for i, (offset, size) in enumerate(container.index)
+        ]
+        for future in futures:
+            future.result()
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(0)
+    lines = [f"meter {rng.randrange(1000):04d} reading {rng.uniform(0, 5000):.1f} kWh\n" for _ in range(200000)]
+    data = ''.join(lines).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'readings.log')
+        packed = os.path.join(tmp, 'readings.hufb')
+        restored = os.path.join(tmp, 'restored.log')
+        with open(src, 'wb') as f:
+            f.write(data)
+        for shared in (False, True):
+            start = time.perf_counter()
+            compress_file(src, packed, block_size=1 << 20, shared_table=shared)
+            mid = time.perf_counter()
+            decompress_file(packed, restored)
+            done = time.perf_counter()
+            with open(restored, 'rb') as f:
+                assert f.read() == data
+            print(f"shared_table={shared}: {len(data)} -> {os.path.getsize(packed)} bytes, "
+                  f"compress {mid - start:.2f} sec, decompress {done - mid:.2f} sec")
+        print("Random access:", BlockFile(packed).read(5_000_000, 5_000_060))
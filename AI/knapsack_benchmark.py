@@ -0,0 +1,153 @@
+# Knapsack solver benchmark
+#
+# Runs every solver in knapsackproblem.py over a matrix of instance sizes,
+# capacity multipliers and value/size correlation classes, and writes median and
+# p95 runtime and peak memory per configuration to CSV. Instances come from
+# fixed seeds; peak memory is measured with tracemalloc in a separate run so
+# tracing does not inflate the timings.
+#
+# Usage:
+#     python knapsack_benchmark.py --ns 10 20 40 --repeats 5 --output results.csv
+import argparse
+import csv
+import random
+import sys
+import time
+import tracemalloc
+
+from knapsackproblem import (Item, knapsack, knapsack_dp, knapsack_dp_numpy,
+                             knapsack_branch_and_bound, knapsack_gray_code,
+                             knapsack_meet_in_middle, np)
+
+# Solver name -> (function, largest n it is run on; None for no limit)
+SOLVERS = {
+    'brute_force': (knapsack, 18),
+    'gray_code': (knapsack_gray_code, 22),
+    # Keeps 2^(n/2) subset sums per half: about 20 MB peak at n=32, 320 MB at n=40
+    'meet_in_middle': (knapsack_meet_in_middle, 32),
+    'dp': (knapsack_dp, None),
+    'dp_numpy': (knapsack_dp_numpy, None),
+    'branch_and_bound': (knapsack_branch_and_bound, None),
+}
+
+CORRELATIONS = ('uncorrelated', 'weakly_correlated', 'strongly_correlated')
+
+CSV_FIELDS = ['solver', 'correlation', 'n', 'capacity_multiplier', 'capacity', 'repeats',
+              'median_time_s', 'p95_time_s', 'median_peak_kb', 'p95_peak_kb', 'max_value']
+
+
+# Reproducible list of n items of a correlation class, sizes drawn from 1..max_size
+def generate_instance(n, correlation, rng, max_size=10):
+    spread = max(1, max_size // 10)
+    items = []
+    for i in range(n):
+        size = rng.randint(1, max_size)
+        if correlation == 'uncorrelated':
+            value = rng.randint(1, max_size)
+        elif correlation == 'weakly_correlated':
+            value = max(1, size + rng.randint(-spread, spread))
+        elif correlation == 'strongly_correlated':
+            value = size + spread
+        else:
+            raise ValueError(f"Unknown correlation class: {correlation}")
+        items.append(Item(f"Item{i+1}", size, value))
+    return items
+
+
+# Nearest-rank percentile of a list of numbers
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(len * pct / 100)
+    return ordered[int(rank) - 1]
+
+
+# Time one solver call, then repeat it under tracemalloc; returns (seconds, peak bytes, max value)
+def measure(solver, items, capacity):
+    start = time.perf_counter()
+    value, _ = solver(items, capacity)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    solver(items, capacity)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, value
+
+
+# Run the solver matrix and yield one result row per configuration. Every solver
+# sees the same `repeats` instances for a (correlation, n, multiplier); raises
+# RuntimeError if two solvers return different optima for an instance
+def run_benchmark(ns, multipliers, correlations, solvers, repeats, seed):
+    for correlation in correlations:
+        for multiplier in multipliers:
+            for n in ns:
+                capacity = int(multiplier * n)
+                instances = [
+                    generate_instance(n, correlation, random.Random(f"{seed}-{correlation}-{n}-{multiplier}-{rep}"))
+                    for rep in range(repeats)
+                ]
+                reference = None        # (solver name, optimum per instance) of the first solver run
+                for name in solvers:
+                    solver, max_n = SOLVERS[name]
+                    if max_n is not None and n > max_n:
+                        continue
+                    times, peaks, values = [], [], []
+                    for items in instances:
+                        elapsed, peak, value = measure(solver, items, capacity)
+                        times.append(elapsed)
+                        peaks.append(peak)
+                        values.append(value)
+                    # All solvers are exact, so any disagreement is a bug in one of them
+                    if reference is None:
+                        reference = (name, values)
+                    elif values != reference[1]:
+                        raise RuntimeError(
+                            f"{name} and {reference[0]} disagree on the optimum for correlation={correlation}, "
+                            f"n={n}, capacity={capacity}: {values} != {reference[1]}")
+                    yield {
+                        'solver': name,
+                        'correlation': correlation,
+                        'n': n,
+                        'capacity_multiplier': multiplier,
+                        'capacity': capacity,
+                        'repeats': repeats,
+                        'median_time_s': f"{percentile(times, 50):.6f}",
+                        'p95_time_s': f"{percentile(times, 95):.6f}",
+                        'median_peak_kb': f"{percentile(peaks, 50) / 1024:.1f}",
+                        'p95_peak_kb': f"{percentile(peaks, 95) / 1024:.1f}",
+                        # Best optimum over the instances, checked identical across solvers above
+                        'max_value': max(values),
+                    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark knapsack solvers")
+    parser.add_argument('--ns', type=int, nargs='+', default=[10, 14, 18, 22, 30, 40, 100, 1000])
+    parser.add_argument('--multipliers', type=float, nargs='+', default=[1.0, 2.5, 4.0])
+    parser.add_argument('--correlations', nargs='+', choices=CORRELATIONS, default=list(CORRELATIONS))
+    parser.add_argument('--solvers', nargs='+', choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    solvers = args.solvers
+    if np is None and 'dp_numpy' in solvers:
+        print("NumPy not installed - skipping dp_numpy", file=sys.stderr)
+        solvers = [name for name in solvers if name != 'dp_numpy']
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in run_benchmark(args.ns, args.multipliers, args.correlations,
+                                 solvers, args.repeats, args.seed):
+            writer.writerow(row)
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Columnar item store for large knapsack instances
+#
+# ItemSet keeps sizes, values and name indexes in parallel typed arrays instead
+# of one Item object per item; the solvers in knapsackproblem.py read the columns
+# directly through item_columns(). Indexing returns an ItemView with the same
+# name / size / value attributes as Item.
+import random
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for as_numpy()
+    np = None
+
+BINARY_MAGIC = b'KSI1'
+# magic, item count, number of names (0 when names are not stored)
+BINARY_HEADER = struct.Struct('<4sQQ')
+
+# Read-only view of one item in an ItemSet, with the same attributes as Item
+class ItemView:
+    __slots__ = ('_items', '_index')
+
+    def __init__(self, items, index):
+        self._items = items
+        self._index = index
+
+    @property
+    def name(self):
+        return self._items.name(self._index)
+
+    @property
+    def size(self):
+        return self._items.sizes[self._index]
+
+    @property
+    def value(self):
+        return self._items.values[self._index]
+
+    def __repr__(self):
+        return f"ItemView({self.name!r}, size={self.size}, value={self.value})"
+
+# Knapsack items stored as parallel int64 arrays; `names` is a table of distinct
+# names (None for default names "Item1", "Item2", ...) indexed by `name_index`
+class ItemSet:
+    __slots__ = ('sizes', 'values', 'names', 'name_index', '_name_lookup')
+
+    def __init__(self, sizes=(), values=(), names=None):
+        self.sizes = array('q', sizes)
+        self.values = array('q', values)
+        if len(self.sizes) != len(self.values):
+            raise ValueError("sizes and values must have the same length")
+        self.names = None
+        self.name_index = array('q')
+        self._name_lookup = None
+        if names is not None:
+            for name in names:
+                self._add_name(name)
+            if len(self.name_index) != len(self.sizes):
+                raise ValueError("names must have the same length as sizes")
+
+    def _add_name(self, name):
+        # Names are interned so that repeated names share one table entry
+        if self.names is None:
+            self.names = []
+            self._name_lookup = {}
+        index = self._name_lookup.get(name)
+        if index is None:
+            index = self._name_lookup[name] = len(self.names)
+            self.names.append(name)
+        self.name_index.append(index)
+
+    # Build an ItemSet from a sequence of Item-like objects
+    @classmethod
+    def from_items(cls, items):
+        items = list(items)
+        return cls((item.size for item in items), (item.value for item in items),
+                   (item.name for item in items))
+
+    # Generate n random items, like generate_items in knapsackproblem.py
+    @classmethod
+    def generate(cls, n, rng=random, max_size=5, max_value=10):
+        randint = rng.randint
+        return cls((randint(1, max_size) for _ in range(n)),
+                   (randint(1, max_value) for _ in range(n)))
+
+    # Add one item to the end of the set
+    def append(self, name, size, value):
+        if self.names is None and name is not None:
+            # Switch from default names to a stored name table
+            for i in range(len(self.sizes)):
+                self._add_name(f"Item{i + 1}")
+        self.sizes.append(size)
+        self.values.append(value)
+        if self.names is not None:
+            self._add_name(name if name is not None else f"Item{len(self.sizes)}")
+
+    # Return the name of the item at `index`
+    def name(self, index):
+        if self.names is None:
+            return f"Item{index + 1}"
+        return self.names[self.name_index[index]]
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            names = None if self.names is None else (self.name(i) for i in indices)
+            return ItemSet((self.sizes[i] for i in indices), (self.values[i] for i in indices), names)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("item index out of range")
+        return ItemView(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield ItemView(self, i)
+
+    # Return (sizes, values) as NumPy arrays sharing memory with the columns
+    def as_numpy(self):
+        if np is None:
+            raise ImportError("as_numpy requires NumPy")
+        return np.frombuffer(self.sizes, dtype=np.int64), np.frombuffer(self.values, dtype=np.int64)
+
+    # Load items from a text file with one "name size value" (or "size value") line per item
+    @classmethod
+    def load_text(cls, path, keep_names=True):
+        # Whitespace or commas separate fields; blank and '#' lines are skipped
+        items = cls()
+        sizes_append = items.sizes.append
+        values_append = items.values.append
+        with open(path) as f:
+            for line in f:
+                fields = line.replace(',', ' ').split()
+                if not fields or fields[0].startswith('#'):
+                    continue
+                sizes_append(int(fields[-2]))
+                values_append(int(fields[-1]))
+                if keep_names:
+                    items._add_name(fields[0] if len(fields) > 2 else f"Item{len(items.sizes)}")
+        return items
+
+    # Save the set in the binary format read by load_binary
+    def save_binary(self, path):
+        # Header, little-endian int64 sizes and values, then name indexes and names if stored
+        name_count = 0 if self.names is None else len(self.names)
+        with open(path, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, len(self), name_count))
+            columns = [self.sizes, self.values] + ([self.name_index] if name_count else [])
+            for column in columns:
+                if sys.byteorder == 'big':
+                    column = array('q', column)
+                    column.byteswap()
+                column.tofile(f)
+            if name_count:
+                f.write('\n'.join(self.names).encode('utf-8'))
+
+    # Load a set written by save_binary
+    @classmethod
+    def load_binary(cls, path):
+        items = cls()
+        with open(path, 'rb') as f:
+            magic, count, name_count = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"{path} is not a knapsack item file")
+            columns = [items.sizes, items.values] + ([items.name_index] if name_count else [])
+            for column in columns:
+                column.fromfile(f, count)
+                if sys.byteorder == 'big':
+                    column.byteswap()
+            if name_count:
+                items.names = f.read().decode('utf-8').split('\n')
+                items._name_lookup = {name: i for i, name in enumerate(items.names)}
+        return items
+
+if __name__ == "__main__":
+    import time
+    from knapsackproblem import knapsack_dp, knapsack_branch_and_bound
+
+    items = ItemSet.generate(200_000, random.Random(0))
+    print(f"Generated {len(items)} items")
+
+    start = time.perf_counter()
+    value, chosen = knapsack_branch_and_bound(items, 50_000)
+    print(f"Branch and bound: value={value}, items={len(chosen)}, "
+          f"time={time.perf_counter() - start:.2f} sec")
+
+    small = items[:200]
+    value, chosen = knapsack_dp(small, 300)
+    print(f"DP on first 200 items: value={value}, e.g. {chosen[:3]}")
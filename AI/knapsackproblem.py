@@ -1,7 +1,13 @@
 import random
 import time
+from bisect import bisect_right
 from itertools import combinations
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for knapsack_dp_numpy
+    np = None
+
 # Define a class to hold item details
 class Item:
     def __init__(self, name, size, value):  # <-- Fixed the typo here
@@ -22,6 +28,194 @@ def knapsack(items, capacity):
                 best_combo = combo
     return max_value, best_combo
 
+# Sizes and values as two parallel sequences; column stores such as
+# knapsack_items.ItemSet already hold them, plain Item lists are unpacked once
+def item_columns(items):
+    sizes = getattr(items, 'sizes', None)
+    values = getattr(items, 'values', None)
+    if sizes is None or values is None:
+        sizes = [item.size for item in items]
+        values = [item.value for item in items]
+    return sizes, values
+
+# Chosen items (by index) in their original order, as knapsack returns them
+def _pick(items, indices):
+    return tuple(items[i] for i in sorted(indices))
+
+# Dynamic-programming solver, O(n * capacity) time
+def knapsack_dp(items, capacity):
+    capacity = int(capacity)
+    if capacity < 0:
+        return 0, ()
+    sizes, values = item_columns(items)
+    # best[c] = best value using the items seen so far with total size <= c
+    best = [0] * (capacity + 1)
+    # taken[i][c] = 1 if item i is part of the best solution for capacity c
+    taken = []
+    for size, value in zip(sizes, values):
+        took = bytearray(capacity + 1)
+        # Walk capacities downwards so each item is used at most once
+        for c in range(capacity, size - 1, -1):
+            candidate = best[c - size] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                took[c] = 1
+        taken.append(took)
+    return best[capacity], _pick(items, _reconstruct(sizes, taken, capacity))
+
+# Walk the per-item take flags backwards to recover the chosen item indices
+def _reconstruct(sizes, taken, capacity, is_taken=lambda took, c: took[c]):
+    chosen = []
+    c = capacity
+    for i in range(len(taken) - 1, -1, -1):
+        if is_taken(taken[i], c):
+            chosen.append(i)
+            c -= sizes[i]
+    return chosen
+
+# Same DP with each capacity row updated as one NumPy vector operation
+def knapsack_dp_numpy(items, capacity):
+    if np is None:
+        raise ImportError("knapsack_dp_numpy requires NumPy")
+    capacity = int(capacity)
+    if capacity < 0:
+        return 0, ()
+    sizes, values = item_columns(items)
+    best = np.zeros(capacity + 1, dtype=np.int64)
+    # Take flags are bit-packed: one bit per capacity per item
+    taken = []
+    for size, value in zip(sizes, values):
+        size, value = int(size), int(value)
+        if size > capacity:
+            taken.append(None)
+            continue
+        # The right-hand side is evaluated before assignment, so this reads
+        # the previous row and behaves like the downward loop in knapsack_dp
+        candidate = best[:capacity + 1 - size] + value
+        took = candidate > best[size:]
+        best[size:] = np.where(took, candidate, best[size:])
+        taken.append((size, np.packbits(took)))
+
+    def is_taken(entry, c):
+        if entry is None or c < entry[0]:
+            return False
+        k = c - entry[0]
+        return bool((entry[1][k >> 3] >> (7 - (k & 7))) & 1)
+
+    return int(best[capacity]), _pick(items, _reconstruct(sizes, taken, capacity, is_taken))
+
+# Branch-and-bound solver using the fractional-knapsack bound, independent of capacity size
+def knapsack_branch_and_bound(items, capacity):
+    if capacity < 0:
+        return 0, ()
+    sizes, values = item_columns(items)
+    n = len(sizes)
+    # Consider items in order of decreasing value density
+    order = sorted(range(n), key=lambda i: values[i] / sizes[i] if sizes[i] else float('inf'), reverse=True)
+    prefix_size = [0] * (n + 1)
+    prefix_value = [0] * (n + 1)
+    for k, i in enumerate(order):
+        prefix_size[k + 1] = prefix_size[k] + sizes[i]
+        prefix_value[k + 1] = prefix_value[k] + values[i]
+
+    # Best value reachable from position k with `room` capacity left if items could be split
+    def bound(k, room):
+        # Last position that still fits whole when taking positions k, k+1, ... greedily
+        last = bisect_right(prefix_size, prefix_size[k] + room, k) - 1
+        value = prefix_value[last] - prefix_value[k]
+        if last < n:
+            i = order[last]
+            value += (room - (prefix_size[last] - prefix_size[k])) * values[i] / sizes[i]
+        return value
+
+    max_value = 0
+    best_choice = None
+    # Depth-first search with an explicit stack: (next position, size used, value, chosen),
+    # where chosen is a linked list (item index, rest) so taking an item is O(1)
+    stack = [(0, 0, 0, None)]
+    while stack:
+        k, size, value, chosen = stack.pop()
+        if value > max_value:
+            max_value = value
+            best_choice = chosen
+        if k == n or value + bound(k, capacity - size) <= max_value:
+            continue
+        i = order[k]
+        # Push "skip" first so the "take" branch is explored first
+        stack.append((k + 1, size, value, chosen))
+        if size + sizes[i] <= capacity:
+            stack.append((k + 1, size + sizes[i], value + values[i], (i, chosen)))
+
+    chosen = []
+    while best_choice is not None:
+        i, best_choice = best_choice
+        chosen.append(i)
+    return max_value, _pick(items, chosen)
+
+# Exhaustive search walking subsets in Gray-code order: consecutive subsets differ
+# by one item, so size and value are updated instead of re-summed
+def knapsack_gray_code(items, capacity):
+    sizes, values = item_columns(items)
+    n = len(sizes)
+    total_size = total_value = 0
+    mask = 0
+    max_value = 0
+    best_mask = 0
+    for k in range(1, 1 << n):
+        # The bit that flips between Gray codes k-1 and k is the lowest set bit of k
+        i = (k & -k).bit_length() - 1
+        bit = 1 << i
+        mask ^= bit
+        if mask & bit:
+            total_size += sizes[i]
+            total_value += values[i]
+        else:
+            total_size -= sizes[i]
+            total_value -= values[i]
+        if total_size <= capacity and total_value > max_value:
+            max_value = total_value
+            best_mask = mask
+    return max_value, _pick(items, [i for i in range(n) if best_mask >> i & 1])
+
+# All (size, value, mask) subsets of items lo..hi-1 that fit, as bitmasks over item indices
+def _half_sums(sizes, values, lo, hi, capacity):
+    subsets = [(0, 0, 0)]
+    for i in range(lo, hi):
+        bit = 1 << i
+        item_size, item_value = sizes[i], values[i]
+        subsets += [(size + item_size, value + item_value, mask | bit)
+                    for size, value, mask in subsets if size + item_size <= capacity]
+    return subsets
+
+# Meet-in-the-middle solver: enumerate each half, prune dominated half-sums, then binary-search pairs
+def knapsack_meet_in_middle(items, capacity):
+    sizes, values = item_columns(items)
+    n = len(sizes)
+    half = n // 2
+    left = _half_sums(sizes, values, 0, half, capacity)
+    right = _half_sums(sizes, values, half, n, capacity)
+
+    # Sort the right half by size and drop entries that are no better than a
+    # smaller one, which leaves sizes and values both strictly increasing
+    right.sort(key=lambda entry: (entry[0], -entry[1]))
+    pruned = []
+    for entry in right:
+        if not pruned or entry[1] > pruned[-1][1]:
+            pruned.append(entry)
+    right_sizes = [entry[0] for entry in pruned]
+
+    max_value = -1
+    best_mask = 0
+    for size, value, mask in left:
+        # Largest right-half subset that still fits is also the most valuable one
+        j = bisect_right(right_sizes, capacity - size) - 1
+        if j >= 0 and value + pruned[j][1] > max_value:
+            max_value = value + pruned[j][1]
+            best_mask = mask | pruned[j][2]
+    if max_value < 0:  # Negative capacity: nothing fits
+        return 0, ()
+    return max_value, _pick(items, [i for i in range(n) if best_mask >> i & 1])
+
 # Generate random list of items
 def generate_items(n):
     items = []
@@ -49,4 +243,5 @@ def run_tests():
             print(f"N={n}, Capacity={capacity}, Avg Time={avg_time:.4f} sec")
 
 # Run the tests
-run_tests()
+if __name__ == "__main__":
+    run_tests()
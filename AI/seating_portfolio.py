@@ -0,0 +1,115 @@
+# Parallel portfolio solver for the seating layout
+#
+# Races several strategies, each in its own worker process, and returns the first
+# valid assignment; the remaining workers are terminated. Backtracking runtimes
+# vary enormously with the order guests and tables are tried in, so racing a few
+# orderings gives a much better worst case than any single one. Strategies:
+# - 'backtracking': the index-order search of layout() in assignment.py
+# - 'dsatur': exact DSatur search from seating_solver.py
+# - 'restarts-<seed>': randomized DSatur with restarts, one per seed
+# - 'greedy-repair': DSatur greedy seating followed by min-conflicts repair
+import multiprocessing
+import queue
+import time
+
+from seating_solver import (dsatur_greedy, layout_dsatur, layout_iterative,
+                            layout_random_restarts, relayout)
+
+# Strategies that explore the whole search space, so their False is a proof
+# that no layout exists; the others can only fail to find one
+EXACT_STRATEGIES = ('backtracking', 'dsatur')
+
+
+# Strategy names used when none are given: the exact ones plus restarts and repair
+def default_strategies(workers=4):
+    strategies = ['dsatur', 'greedy-repair', 'backtracking']
+    seed = 1
+    while len(strategies) < workers:
+        strategies.append(f"restarts-{seed}")
+        seed += 1
+    return strategies[:max(workers, 1)]
+
+
+# Run one strategy in the current process; returns {guest: table}, False if the
+# strategy proved no layout exists, or None if it gave up without an answer
+def run_strategy(name, N, C, L):
+    if name == 'backtracking':
+        # Same search as layout(), without its one-frame-per-guest recursion
+        return layout_iterative(N, C, L)
+    if name == 'dsatur':
+        return layout_dsatur(N, C, L)
+    if name.startswith('restarts-'):
+        return layout_random_restarts(N, C, L, seed=int(name.split('-', 1)[1]))
+    if name == 'greedy-repair':
+        result = relayout(dsatur_greedy(N, C, L), C, L, max_steps=50 * N + 1000, fallback=False)
+        return result if result else None
+    raise ValueError(f"Unknown strategy: {name}")
+
+
+def _worker(name, N, C, L, results):
+    try:
+        results.put((name, run_strategy(name, N, C, L)))
+    except Exception as e:
+        print(f"Strategy {name} failed: {e}")
+        results.put((name, None))
+
+
+# Same arguments and result as layout(N, C, L), racing one worker process per
+# strategy; returns None on timeout or if every strategy gave up
+def layout_portfolio(N, C, L, strategies=None, timeout=None):
+    if N == 0:
+        return {}
+    if C <= 0:
+        return False
+    strategies = list(strategies or default_strategies())
+
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_worker, args=(name, N, C, L, results), daemon=True)
+        for name in strategies
+    ]
+    for worker in workers:
+        worker.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    answer = None
+    try:
+        for _ in strategies:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                name, result = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if result:
+                answer = result
+                break
+            if result is False and name in EXACT_STRATEGIES:
+                answer = False
+                break
+    finally:
+        # Cancel whichever strategies are still running
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+    return answer
+
+
+if __name__ == "__main__":
+    import random
+
+    print(layout_portfolio(4, 2, [(0, 1), (1, 2), (2, 3)]))
+
+    rng = random.Random(3)
+    N, C = 1500, 5
+    L = [(rng.randrange(N), rng.randrange(N)) for _ in range(4 * N)]
+    L = [(a, b) for a, b in L if a != b]
+    start = time.perf_counter()
+    result = layout_portfolio(N, C, L, timeout=60)
+    elapsed = time.perf_counter() - start
+    if result:
+        assert all(result[a] != result[b] for a, b in L)
+        print(f"Seated {N} guests in {elapsed:.2f} sec")
+    else:
+        print(f"No layout found ({result}) in {elapsed:.2f} sec")
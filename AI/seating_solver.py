@@ -0,0 +1,412 @@
+# Seating layout as graph coloring (DSatur), same problem and result format as
+# layout(N, C, L) in assignment.py: {guest: table}, or False if impossible
+#
+# Unlike the index-order backtracking in assignment.py this scales to thousands
+# of guests:
+# - each guest's possible tables are a bitset, with a count per (guest, table)
+#   of conflicting guests already seated there
+# - DSatur ordering: the guest with the fewest possible tables goes next
+# - forward checking abandons a branch as soon as a guest has no table left
+# - empty tables are interchangeable, so only the first one is ever tried
+# The search uses an explicit stack, so it is not limited by recursion depth.
+import heapq
+import random
+import time
+
+
+# conflicts[g] is the set of guests that cannot sit with guest g
+def build_conflicts(N, L):
+    conflicts = [set() for _ in range(N)]
+    for a, b in L:
+        if a != b:
+            conflicts[a].add(b)
+            conflicts[b].add(a)
+    return conflicts
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+# DSatur backtracking; seed breaks ties between equally constrained guests and
+# table order randomly (for restarts / portfolios). Returns None if node_limit
+# seating attempts run out first
+def layout_dsatur(N, C, L, seed=None, node_limit=None):
+    if N == 0:
+        return {}
+    if C <= 0:
+        return False
+    for a, b in L:
+        if a == b:  # A guest in conflict with themselves can never be seated
+            return False
+
+    conflicts = [list(s) for s in build_conflicts(N, L)]
+    degree = [len(s) for s in conflicts]
+    all_tables = (1 << C) - 1
+
+    domain = [all_tables] * N       # Bitset of tables guest g can still use
+    blocked = [0] * (N * C)         # blocked[g*C + t] = conflicting guests seated at t
+    table_of = [-1] * N
+    table_size = [0] * C
+    opened = 0                      # Tables 0..opened-1 are the non-empty ones
+
+    # Tie-break rank between guests with equal domain size and degree
+    rng = random.Random(seed) if seed is not None else None
+    rank = list(range(N))
+    if rng:
+        rng.shuffle(rank)
+
+    # Lazy priority queue of (domain size, -degree, rank, guest); entries whose size
+    # no longer matches the guest's domain, or for seated guests, are stale
+    heap = [(C, -degree[g], rank[g], g) for g in range(N)]
+    heapq.heapify(heap)
+
+    def push(g):
+        heapq.heappush(heap, (_popcount(domain[g]), -degree[g], rank[g], g))
+
+    def select_guest():
+        while heap:
+            size, _, _, g = heapq.heappop(heap)
+            if table_of[g] == -1 and size == _popcount(domain[g]):
+                return g
+        return -1
+
+    # Seat g at t and forward-check; returns (changed neighbours, wiped out)
+    def seat(g, t):
+        nonlocal opened
+        table_of[g] = t
+        table_size[t] += 1
+        if table_size[t] == 1:
+            opened += 1
+        changed = []
+        wiped_out = False
+        bit = 1 << t
+        for h in conflicts[g]:
+            if table_of[h] != -1:
+                continue
+            idx = h * C + t
+            if blocked[idx] == 0:
+                domain[h] &= ~bit
+                changed.append(h)
+                if domain[h] == 0:
+                    wiped_out = True
+            blocked[idx] += 1
+        return changed, wiped_out
+
+    def unseat(g, changed):
+        nonlocal opened
+        t = table_of[g]
+        bit = 1 << t
+        for h in conflicts[g]:
+            if table_of[h] == -1:
+                blocked[h * C + t] -= 1
+        for h in changed:
+            domain[h] |= bit
+            push(h)
+        table_size[t] -= 1
+        if table_size[t] == 0:
+            opened -= 1
+        table_of[g] = -1
+
+    def candidates(g):
+        # Symmetry breaking: of the empty tables, only the first one is tried
+        limit = min(opened + 1, C)
+        return domain[g] & ((1 << limit) - 1)
+
+    # Each frame: [guest, remaining candidate tables, changes from current seat or None]
+    g = select_guest()
+    stack = [[g, candidates(g), None]]
+    nodes = 0
+    while stack:
+        frame = stack[-1]
+        g, cands, changed = frame
+        if changed is not None:
+            unseat(g, changed)
+            frame[2] = None
+        if cands == 0:
+            # No table left for this guest: backtrack to the previous one
+            stack.pop()
+            push(g)
+            continue
+
+        nodes += 1
+        if node_limit is not None and nodes > node_limit:
+            return None
+        if rng:
+            tables = [t for t in range(C) if cands >> t & 1]
+            low = 1 << rng.choice(tables)
+        else:
+            low = cands & -cands
+        frame[1] = cands ^ low
+        changed, wiped_out = seat(g, low.bit_length() - 1)
+        frame[2] = changed
+        if wiped_out:
+            continue
+        for h in changed:
+            push(h)
+
+        nxt = select_guest()
+        if nxt == -1:
+            return {guest: table_of[guest] for guest in range(N)}
+        stack.append([nxt, candidates(nxt), None])
+
+    return False
+
+
+# Same search as layout() in assignment.py with an explicit stack, so the same
+# layout is returned for any number of guests. Returns None if node_budget
+# (seating attempts) or timeout runs out first; with return_partial, returns
+# (result, complete) instead, where an incomplete result is the deepest
+# conflict-free prefix of guests found
+def layout_iterative(N, C, L, node_budget=None, timeout=None, return_partial=False):
+    conflicts = build_conflicts(N, L)
+    # Only guests seated before g matter when seating g
+    earlier = [[h for h in conflicts[g] if h < g] for g in range(N)]
+
+    table_of = [-1] * N
+    next_table = [0] * (N + 1)      # Next table to try for each guest
+    best = []                       # Tables of the deepest conflict-free prefix
+    deadline = None if timeout is None else time.monotonic() + timeout
+    nodes = next_check = 0
+
+    def finish(result, complete=True):
+        return (result, complete) if return_partial else result
+
+    guest = 0
+    while guest < N:
+        if guest < 0:
+            return finish(False)  # Every option for guest 0 has been exhausted
+
+        # Try the remaining tables for this guest
+        t = next_table[guest]
+        while t < C:
+            nodes += 1
+            if all(table_of[h] != t for h in earlier[guest]):
+                break
+            t += 1
+
+        out_of_time = False
+        if deadline is not None and nodes >= next_check:
+            next_check = nodes + 256  # Only look at the clock every few hundred nodes
+            out_of_time = time.monotonic() > deadline
+        if out_of_time or (node_budget is not None and nodes >= node_budget):
+            if t < C and guest + 1 > len(best):
+                table_of[guest] = t
+                best = table_of[:guest + 1]
+            return (dict(enumerate(best)), False) if return_partial else None
+
+        if t < C:
+            # Seat the guest and move on to the next one
+            table_of[guest] = t
+            next_table[guest] = t + 1
+            guest += 1
+            next_table[guest] = 0
+            if guest > len(best):
+                best = table_of[:guest]
+        else:
+            # No table works: backtrack to the previous guest
+            table_of[guest] = -1
+            guest -= 1
+            if guest >= 0:
+                table_of[guest] = -1
+
+    return finish(dict(enumerate(table_of)))
+
+
+# Randomized DSatur with restarts and a growing node limit: a run stuck after a
+# bad early choice is cut off and retried with a new seed. Returns None if
+# max_restarts runs all hit their limit
+def layout_random_restarts(N, C, L, seed=0, first_limit=100, growth=1.5, max_restarts=None):
+    rng = random.Random(seed)
+    limit = first_limit
+    restarts = 0
+    while max_restarts is None or restarts < max_restarts:
+        result = layout_dsatur(N, C, L, seed=rng.getrandbits(32), node_limit=int(limit))
+        if result is not None:
+            return result
+        limit *= growth
+        restarts += 1
+    return None
+
+
+# Seat guests in DSatur order without backtracking, each at the first table with
+# no conflicting guest (else the least conflicting one); the result may contain
+# conflicts, which relayout() can repair
+def dsatur_greedy(N, C, L):
+    conflicts = build_conflicts(N, L)
+    seating = {}
+    blocked = [0] * N               # Bitset of tables already used by a neighbour
+    heap = [(0, -len(conflicts[g]), g) for g in range(N)]
+    while heap:
+        saturation, _, g = heapq.heappop(heap)
+        if g in seating or -saturation != _popcount(blocked[g]):
+            continue
+        free = ~blocked[g] & ((1 << C) - 1)
+        if free:
+            t = (free & -free).bit_length() - 1
+        else:
+            counts = _table_counts(g, conflicts, seating, C)
+            t = counts.index(min(counts))
+        seating[g] = t
+        for h in conflicts[g]:
+            if h not in seating and not blocked[h] >> t & 1:
+                blocked[h] |= 1 << t
+                heapq.heappush(heap, (-_popcount(blocked[h]), -len(conflicts[h]), h))
+    return dict(sorted(seating.items()))
+
+
+# Number of the guest's conflicting guests seated at each table
+def _table_counts(guest, conflicts, seating, C):
+    counts = [0] * C
+    for other in conflicts[guest]:
+        t = seating.get(other)
+        if t is not None:
+            counts[t] += 1
+    return counts
+
+
+# Guests reachable from guest's neighbours at table b through conflicts, staying
+# on tables a and b and never passing through guest itself
+def _kempe_chain(guest, a, b, conflicts, seating):
+    start = [other for other in conflicts[guest] if seating.get(other) == b]
+    chain = set(start)
+    while start:
+        current = start.pop()
+        for other in conflicts[current]:
+            if other != guest and other not in chain and seating.get(other) in (a, b):
+                chain.add(other)
+                start.append(other)
+    return chain
+
+
+# Repair an existing layout after conflicts or the guest list change: removed
+# guests are dropped, new ones take their least-conflicting table, and the
+# remaining conflicts are fixed with min-conflicts moves and Kempe-chain swaps.
+# With fallback, re-solve with layout_dsatur if max_steps runs out. Guests seated
+# at a table >= C (when moving to fewer tables) are re-seated like new guests
+def relayout(assignment, C, L, new_conflicts=(), added_guests=(), removed_guests=(),
+             max_steps=10000, seed=None, fallback=True):
+    removed = set(removed_guests)
+    both = removed.intersection(added_guests)
+    if both:
+        raise ValueError(f"Guests both added and removed: {sorted(both)}")
+    guests = {g for g in assignment if g not in removed}
+    guests.update(added_guests)
+    seating = {g: t for g, t in assignment.items() if g in guests and 0 <= t < C}
+
+    conflicts = {g: set() for g in guests}
+    for a, b in list(L) + list(new_conflicts):
+        if a in guests and b in guests:
+            if a == b:
+                return False
+            conflicts[a].add(b)
+            conflicts[b].add(a)
+    if guests and C <= 0:
+        return False
+
+    rng = random.Random(seed)
+
+    # Seat new guests at their least-conflicting table (emptiest on ties)
+    load = [0] * C
+    for t in seating.values():
+        load[t] += 1
+    for g in sorted(guests - set(seating)):
+        counts = _table_counts(g, conflicts, seating, C)
+        t = min(range(C), key=lambda t: (counts[t], load[t]))
+        seating[g] = t
+        load[t] += 1
+
+    def is_conflicted(g):
+        t = seating[g]
+        return any(seating[other] == t for other in conflicts[g])
+
+    conflicted = {g for g in guests if is_conflicted(g)}
+
+    def moved(group):
+        for g in group:
+            for h in conflicts[g] | {g}:
+                if is_conflicted(h):
+                    conflicted.add(h)
+                else:
+                    conflicted.discard(h)
+
+    for _ in range(max_steps):
+        if not conflicted:
+            return dict(sorted(seating.items()))
+        g = rng.choice(sorted(conflicted))
+        current = seating[g]
+        counts = _table_counts(g, conflicts, seating, C)
+        fewest = min(counts)
+
+        if fewest < counts[current]:
+            # Plain min-conflicts move
+            seating[g] = rng.choice([t for t in range(C) if counts[t] == fewest])
+            moved([g])
+            continue
+
+        # Kempe-chain move: swap tables `current` and b within the chain that
+        # blocks table b, then seat g at b if that leaves it with fewer conflicts
+        best = None
+        for b in range(C):
+            if b == current:
+                continue
+            chain = _kempe_chain(g, current, b, conflicts, seating)
+            cost = sum(1 for other in conflicts[g] if other in chain and seating[other] == current)
+            if cost < counts[current] and (best is None or cost < best[0]):
+                best = (cost, b, chain)
+        if best is not None:
+            _, b, chain = best
+            for other in chain:
+                seating[other] = b if seating[other] == current else current
+            seating[g] = b
+            moved(chain | {g})
+            continue
+
+        # Plateau: random sideways move to escape the local minimum
+        others = [t for t in range(C) if t != current and counts[t] == fewest]
+        if others:
+            seating[g] = rng.choice(others)
+            moved([g])
+
+    if not conflicted:
+        return dict(sorted(seating.items()))
+    if not fallback:
+        return False
+
+    # Local repair failed: solve from scratch on compact guest numbers
+    order = sorted(guests)
+    index = {g: i for i, g in enumerate(order)}
+    pairs = [(index[a], index[b]) for a in order for b in conflicts[a] if a < b]
+    result = layout_dsatur(len(order), C, pairs)
+    if result is False:
+        return False
+    return {order[i]: t for i, t in result.items()}
+
+
+if __name__ == "__main__":
+    print(layout_dsatur(4, 2, [(0, 1), (1, 2), (2, 3)]))
+
+    # Random event: 2000 guests, 3 conflicts each on average, 6 tables
+    rng = random.Random(1)
+    N, C = 2000, 6
+    L = [(rng.randrange(N), rng.randrange(N)) for _ in range(3 * N)]
+    L = [(a, b) for a, b in L if a != b]
+    start = time.perf_counter()
+    result = layout_dsatur(N, C, L)
+    elapsed = time.perf_counter() - start
+    if result:
+        assert all(result[a] != result[b] for a, b in L)
+        print(f"Seated {N} guests at {len(set(result.values()))} tables in {elapsed:.3f} sec")
+    else:
+        print(f"No valid layout ({elapsed:.3f} sec)")
+
+    # Late changes: two guests cancel, three join, and ten new conflicts appear
+    if result:
+        new_conflicts = [(rng.randrange(N), rng.randrange(N)) for _ in range(10)]
+        new_conflicts = [(a, b) for a, b in new_conflicts if a != b]
+        start = time.perf_counter()
+        updated = relayout(result, C, L, new_conflicts=new_conflicts + [(N, 0), (N + 1, N)],
+                           added_guests=[N, N + 1, N + 2], removed_guests=[5, 7], seed=1)
+        elapsed = time.perf_counter() - start
+        changed = sum(1 for g in updated if g in result and updated[g] != result[g])
+        print(f"Re-layout seated {len(updated)} guests, moving {changed}, in {elapsed:.3f} sec")
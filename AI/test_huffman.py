@@ -0,0 +1,30 @@
+from huffman import MAX_CODE_LENGTH, Decoder, Encoder, TableDecoder, code_lengths
+
+# Fibonacci-like frequencies: an unlimited Huffman tree would be 39 levels deep
+def fibonacci_freq(n=40):
+    freq = [0] * 256
+    a, b = 1, 1
+    for symbol in range(n):
+        freq[symbol] = a
+        a, b = b, a + b
+    return freq
+
+
+def test_code_lengths_are_limited_and_complete():
+    lengths = code_lengths(fibonacci_freq())
+    assert max(lengths) == MAX_CODE_LENGTH
+    assert sum(2 ** (MAX_CODE_LENGTH - l) for l in lengths if l) == 2 ** MAX_CODE_LENGTH
+    # The most frequent symbol keeps the shortest code
+    assert lengths[39] == min(l for l in lengths if l)
+
+
+def test_table_decoder_on_skewed_lengths():
+    lengths = code_lengths(fibonacci_freq())
+    data = bytes(range(40)) * 3 + bytes([39]) * 500
+    encoder = Encoder(lengths)
+    blob = encoder.encode(data) + encoder.flush()
+
+    decoder = TableDecoder(lengths)
+    assert all(len(table) <= 1 << (MAX_CODE_LENGTH - decoder.primary_bits) for table in decoder.sub_sym)
+    assert decoder.decode(blob, len(data)) == data
+    assert Decoder(lengths).decode(blob, len(data)) == data
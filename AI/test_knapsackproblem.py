@@ -0,0 +1,18 @@
+import pytest
+
+from knapsackproblem import (Item, knapsack, knapsack_branch_and_bound, knapsack_dp,
+                             knapsack_dp_numpy, knapsack_gray_code, knapsack_meet_in_middle, np)
+
+SOLVERS = [knapsack, knapsack_gray_code, knapsack_meet_in_middle, knapsack_dp,
+           knapsack_branch_and_bound]
+if np is not None:
+    SOLVERS.append(knapsack_dp_numpy)
+
+
+# Negative capacity with zero-size items: nothing fits, not even the free items
+@pytest.mark.parametrize('solver', SOLVERS, ids=lambda solver: solver.__name__)
+def test_negative_capacity_with_zero_size_items(solver):
+    items = [Item("Free", 0, 5), Item("Small", 1, 3), Item("Zero", 0, 0)]
+    value, chosen = solver(items, -1)
+    assert value == 0
+    assert tuple(chosen) == ()
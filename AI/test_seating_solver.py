@@ -0,0 +1,31 @@
+import pytest
+
+from seating_solver import layout_iterative, relayout
+
+
+def valid(seating, L):
+    return all(seating[a] != seating[b] for a, b in L)
+
+
+# Guests at tables that no longer exist are re-seated instead of indexing out of range
+def test_relayout_onto_fewer_tables():
+    assert relayout({0: 0, 1: 1, 2: 0}, 1, [(0, 1)]) is False
+    L = [(0, 1), (1, 2), (2, 3), (3, 0)]
+    seating = relayout({0: 0, 1: 1, 2: 2, 3: 1}, 2, L)
+    assert set(seating) == {0, 1, 2, 3}
+    assert valid(seating, L) and all(t < 2 for t in seating.values())
+
+
+def test_relayout_rejects_guest_both_added_and_removed():
+    with pytest.raises(ValueError):
+        relayout({0: 0}, 2, [], added_guests=[1], removed_guests=[1])
+
+
+# Running out of budget must not look like a complete layout
+def test_layout_iterative_budget_exhausted():
+    N = 30
+    L = [(a, b) for a in range(N) for b in range(a + 1, N)]    # Needs N tables
+    assert layout_iterative(N, N - 1, L, node_budget=500) is None
+    partial, complete = layout_iterative(N, N - 1, L, node_budget=500, return_partial=True)
+    assert not complete and 0 < len(partial) < N and valid(partial, [(a, b) for a, b in L if b in partial])
+    assert layout_iterative(4, 2, [(0, 1), (1, 2), (2, 3)], return_partial=True) == ({0: 0, 1: 1, 2: 0, 3: 1}, True)
@@ -0,0 +1,162 @@
+# Batch LCS similarity scoring, with the same lengths as lcs_dp in assignment4.py
+#
+# - The query is turned into per-character bit masks once, and each candidate is
+#   scored with the bit-parallel LCS recurrence instead of a DP table per pair
+# - Candidates that cannot reach the threshold are pruned with cheap upper bounds
+# - Large batches are split into chunks and scored across a process pool
+# Similarity is LCS length / length of the longer string (1.0 = identical).
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Query string data reused for every candidate: length, character histogram and
+# a bit mask of the positions of each character
+class QueryProfile:
+    __slots__ = ('text', 'length', 'masks', 'histogram', 'full_mask')
+
+    def __init__(self, text):
+        self.text = text
+        self.length = len(text)
+        self.histogram = Counter(text)
+        self.full_mask = (1 << self.length) - 1
+
+        # Bit i of masks[ch] is set when text[i] == ch
+        masks = {}
+        for i, ch in enumerate(text):
+            masks[ch] = masks.get(ch, 0) | (1 << i)
+        self.masks = masks
+
+
+# LCS length of a profiled query and a candidate: a few big-int operations per
+# candidate character instead of a full row of the DP table
+def lcs_length(profile, candidate):
+    masks = profile.masks
+    v = profile.full_mask
+    for ch in candidate:
+        u = v & masks.get(ch, 0)
+        v = (v + u) | (v - u)
+    # Every zero bit among the low `length` bits is one matched character
+    return profile.length - bin(v & profile.full_mask).count('1')
+
+
+# LCS similarity (0.0 - 1.0) between a profiled query and a candidate
+def similarity(profile, candidate):
+    longest = max(profile.length, len(candidate))
+    if longest == 0:
+        return 1.0
+    return lcs_length(profile, candidate) / longest
+
+
+# Cheap upper bound on the similarity: the LCS is no longer than the shorter
+# string and uses each character at most as often as it occurs in both
+def upper_bound(profile, candidate):
+    longest = max(profile.length, len(candidate))
+    if longest == 0:
+        return 1.0
+    bound = min(profile.length, len(candidate))
+    histogram = profile.histogram
+    shared = 0
+    for ch, n in Counter(candidate).items():
+        shared += min(n, histogram.get(ch, 0))
+    return min(bound, shared) / longest
+
+
+# Score a slice of candidates; returns (index, similarity) pairs above threshold
+def _score_chunk(profile, candidates, start, threshold):
+    results = []
+    for offset, candidate in enumerate(candidates):
+        # Skip the LCS entirely when the bound already rules the candidate out
+        if threshold > 0 and upper_bound(profile, candidate) < threshold:
+            continue
+        score = similarity(profile, candidate)
+        if score >= threshold:
+            results.append((start + offset, score))
+    return results
+
+
+# Worker state, set once per process by the pool initializer so that the
+# query profile / string set is not re-pickled with every chunk
+_worker_profile = None
+_worker_strings = None
+
+
+def _init_query_worker(query):
+    global _worker_profile
+    _worker_profile = QueryProfile(query)
+
+
+def _query_worker(start, candidates, threshold):
+    return _score_chunk(_worker_profile, candidates, start, threshold)
+
+
+def _init_pairs_worker(strings):
+    global _worker_strings
+    _worker_strings = strings
+
+
+def _pairs_worker(rows, threshold):
+    return _score_rows(_worker_strings, rows, threshold)
+
+
+# Score strings[i] against every later string for each i in rows
+def _score_rows(strings, rows, threshold):
+    results = []
+    for i in rows:
+        profile = QueryProfile(strings[i])
+        for j, score in _score_chunk(profile, strings[i + 1:], i + 1, threshold):
+            results.append((i, j, score))
+    return results
+
+
+# Score one query against many candidates; returns (candidate_index, similarity)
+# for candidates scoring at least threshold, in order. processes=None or 1 runs in-process
+def score_candidates(query, candidates, threshold=0.0, processes=None, chunk_size=1000):
+    candidates = list(candidates)
+    if not processes or processes == 1:
+        return _score_chunk(QueryProfile(query), candidates, 0, threshold)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_query_worker,
+                             initargs=(query,)) as pool:
+        futures = [
+            pool.submit(_query_worker, start, candidates[start:start + chunk_size], threshold)
+            for start in range(0, len(candidates), chunk_size)
+        ]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+# Score every pair (i, j), i < j, within a set of strings; returns (i, j, similarity)
+# tuples. Each string is profiled once and compared with all later strings
+def score_all_pairs(strings, threshold=0.0, processes=None, rows_per_task=16):
+    strings = list(strings)
+    if not processes or processes == 1:
+        return _score_rows(strings, range(len(strings)), threshold)
+
+    # Interleave rows so that every task gets a mix of long and short rows
+    n = len(strings)
+    task_count = max(1, (n + rows_per_task - 1) // rows_per_task)
+    results = []
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_pairs_worker,
+                             initargs=(strings,)) as pool:
+        futures = [
+            pool.submit(_pairs_worker, range(t, n, task_count), threshold)
+            for t in range(task_count)
+        ]
+        for future in futures:
+            results.extend(future.result())
+    results.sort()
+    return results
+
+
+if __name__ == "__main__":
+    records = ["Jonathan Smith", "Jonathon Smith", "John Smith", "Jane Smyth", "J. Smith", "Alice Jones"]
+
+    print("Query 'Jon Smith' against records:")
+    for index, score in score_candidates("Jon Smith", records):
+        print(f"  {records[index]:<15} {score:.2f}")
+
+    print("\nPairs with similarity >= 0.7:")
+    for i, j, score in score_all_pairs(records, threshold=0.7, processes=2):
+        print(f"  {records[i]!r} ~ {records[j]!r}: {score:.2f}")
@@ -0,0 +1,79 @@
+# Vectorized LCS DP table with NumPy, same result as lcs_dp in assignment4.py
+#
+# Every cell on an anti-diagonal (i + j constant) depends only on the two
+# previous diagonals, so the table is filled a whole diagonal at a time. It is
+# one flat uint16/uint32 array instead of nested Python lists.
+import numpy as np
+
+
+# String as an array of code points for vectorized comparisons
+def _as_codes(s):
+    return np.frombuffer(s.encode('utf-32-le'), dtype=np.uint32)
+
+
+# Full LCS DP table by sweeping anti-diagonals; entry [i][j] is the LCS length
+# of s1[:i] and s2[:j]
+def lcs_table_numpy(s1, s2):
+    m, n = len(s1), len(s2)
+    # Table values never exceed min(m, n), so pick the smallest type that fits
+    dtype = np.uint16 if min(m, n) < np.iinfo(np.uint16).max else np.uint32
+    dp = np.zeros((m + 1) * (n + 1), dtype=dtype)
+    if m == 0 or n == 0:
+        return dp.reshape(m + 1, n + 1)
+
+    a = _as_codes(s1)
+    b_rev = _as_codes(s2)[::-1]
+    width = n + 1
+
+    # Cells on a diagonal are n apart in the flat table ((i+1, j-1) follows (i, j)),
+    # so every diagonal and its three neighbours are plain strided slices
+    for d in range(2, m + n + 1):
+        lo = max(1, d - n)
+        hi = min(m, d - 1)
+        count = hi - lo + 1
+        start = lo * width + (d - lo)
+        stop = start + count * n
+
+        up = dp[start - width:stop - width:n]
+        left = dp[start - 1:stop - 1:n]
+        diag = dp[start - width - 1:stop - width - 1:n]
+
+        # s1[i-1] for i = lo..hi against s2[j-1] for j = d-lo down to d-hi
+        match = a[lo - 1:hi] == b_rev[n - d + lo:n - d + hi + 1]
+
+        cell = np.maximum(up, left)
+        np.copyto(cell, diag + 1, where=match)  # Characters match
+        dp[start:stop:n] = cell
+
+    return dp.reshape(m + 1, n + 1)
+
+
+# LCS length and subsequence using the vectorized DP table
+def lcs_dp_numpy(s1, s2):
+    dp = lcs_table_numpy(s1, s2)
+    m, n = len(s1), len(s2)
+
+    # Backtrack to build the LCS string (same tie-breaking as lcs_dp)
+    lcs = []
+    i, j = m, n
+    while i > 0 and j > 0:
+        if s1[i-1] == s2[j-1]:
+            lcs.append(s1[i-1])  # Add character to LCS
+            i -= 1
+            j -= 1
+        elif dp[i-1, j] >= dp[i, j-1]:
+            i -= 1  # Move up
+        else:
+            j -= 1  # Move left
+    lcs.reverse()  # Reverse to get correct order
+
+    return int(dp[m, n]), ''.join(lcs)
+
+
+if __name__ == "__main__":
+    s1 = input("Enter first string: ")
+    s2 = input("Enter second string: ")
+
+    length, subseq = lcs_dp_numpy(s1, s2)
+    print(f"Length of LCS: {length}")
+    print(f"Longest Common Subsequence: {subseq}")
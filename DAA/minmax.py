@@ -0,0 +1,136 @@
+# Min and max of large data sets, ported from minmaxelements.c++
+#
+# minmax() is the recursive divide and conquer from the C++ version. For data
+# that does not fit in memory the other functions work in fixed-size chunks:
+# - minmax_pairwise: one pass, 3n/2 comparisons (compare each pair of elements
+#   with each other first, then only the smaller with min and the larger with max)
+# - minmax_stream: any iterable/iterator, consumed chunk by chunk
+# - minmax_array: NumPy arrays (each chunk reduced with vectorized min/max)
+# - minmax_file: binary files of fixed-size numbers through np.memmap, optionally
+#   split across worker processes whose partial results are then combined
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for minmax_array / minmax_file
+    np = None
+
+CHUNK_SIZE = 1 << 20
+_END = object()
+
+# Function to find minimum and maximum using divide and conquer
+def minmax(a, low, high):
+    # If only one element
+    if low == high:
+        return a[low], a[low]
+    # If two elements
+    if low == high - 1:
+        if a[low] < a[high]:
+            return a[low], a[high]
+        return a[high], a[low]
+    # If more than two elements: recurse on both halves and compare the results
+    mid = (low + high) // 2
+    min1, max1 = minmax(a, low, mid)
+    min2, max2 = minmax(a, mid + 1, high)
+    return min(min1, min2), max(max1, max2)
+
+# Combine two (min, max) results; None stands for "no elements yet"
+def _combine(result, other):
+    if result is None:
+        return other
+    if other is None:
+        return result
+    return min(result[0], other[0]), max(result[1], other[1])
+
+# One pass over any iterable with the pairwise-comparison trick
+def minmax_pairwise(seq, start=None):
+    it = iter(seq)
+    if start is None:
+        first = next(it, _END)
+        if first is _END:
+            return None
+        lo = hi = first
+    else:
+        lo, hi = start
+    # Take the elements two at a time
+    for x in it:
+        y = next(it, _END)
+        if y is _END:
+            # Odd element at the end: compare it with both
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+            break
+        if x < y:
+            if x < lo:
+                lo = x
+            if y > hi:
+                hi = y
+        else:
+            if y < lo:
+                lo = y
+            if x > hi:
+                hi = x
+    return lo, hi
+
+# Streaming iterables: fixed-size chunks, so only one chunk is held at a time
+def minmax_stream(iterable, chunk_size=CHUNK_SIZE):
+    it = iter(iterable)
+    result = None
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return result
+        result = minmax_pairwise(chunk, result)
+
+def minmax_array(arr, chunk_size=CHUNK_SIZE):
+    if np is None:
+        raise ImportError("minmax_array requires NumPy")
+    arr = np.asarray(arr).ravel()
+    result = None
+    # Chunks keep the two reductions cache-resident, so the data is streamed from memory once
+    for start in range(0, arr.size, chunk_size):
+        chunk = arr[start:start + chunk_size]
+        result = _combine(result, (chunk.min().item(), chunk.max().item()))
+    return result
+
+# Map only elements [start, stop), so trailing partial bytes are never touched
+def _minmax_file_range(path, dtype, offset, start, stop, chunk_size):
+    dtype = np.dtype(dtype)
+    data = np.memmap(path, dtype=dtype, mode='r', offset=offset + start * dtype.itemsize,
+                     shape=(stop - start,))
+    return minmax_array(data, chunk_size)
+
+def minmax_file(path, dtype='<i4', offset=0, chunk_size=CHUNK_SIZE, processes=None):
+    # path: binary file of fixed-size numbers of type `dtype`, after `offset` header bytes
+    if np is None:
+        raise ImportError("minmax_file requires NumPy")
+    dtype = np.dtype(dtype)
+    count = (os.path.getsize(path) - offset) // dtype.itemsize
+    if count <= 0:
+        return None
+    if not processes or processes == 1:
+        return _minmax_file_range(path, dtype, offset, 0, count, chunk_size)
+    # Each worker maps the file itself and reduces one contiguous range
+    step = -(-count // processes)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_minmax_file_range, path, dtype.str, offset, start,
+                               min(start + step, count), chunk_size)
+                   for start in range(0, count, step)]
+        result = None
+        for future in futures:
+            result = _combine(result, future.result())
+    return result
+
+if __name__ == "__main__":
+    a = [int(x) for x in input("Enter 10 elements of the array:\n").split()[:10]]
+
+    # Call minmax on the full array
+    min_value, max_value = minmax(a, 0, len(a) - 1)
+
+    # Output the result
+    print(f"Maximum element: {max_value}")
+    print(f"Minimum element: {min_value}")
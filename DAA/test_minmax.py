@@ -0,0 +1,14 @@
+import pytest
+
+from minmax import minmax_file, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="minmax_file requires NumPy")
+
+
+# Trailing bytes that do not make up a whole element are ignored
+@pytest.mark.parametrize('processes', [None, 3])
+def test_file_with_trailing_partial_element(tmp_path, processes):
+    path = tmp_path / 'numbers.bin'
+    values = np.array([7, -3, 12, 5, 0, 9, -8, 4], dtype='<i4')
+    path.write_bytes(b'HDR' + values.tobytes() + b'\x01\x02')
+    assert minmax_file(path, dtype='<i4', offset=3, chunk_size=3, processes=processes) == (-8, 12)
@@ -1,4 +1,3 @@
-import json
 import socket
 import threading
 import time
@@ -12,19 +11,10 @@ class ReliableNode(SocketNode):
         self.failed_nodes = set()
         self.timeout_duration = 5
         
-    def handle_message(self, client_socket):
-        try:
-            # Simulate message processing delay
-            time.sleep(random.uniform(0.1, 0.5))
-            
-            data = client_socket.recv(1024).decode('utf-8')
-            if data:
-                message = json.loads(data)
-                self.process_message(message)
-        except Exception as e:
-            print(f"Node {self.id} error handling message: {e}")
-        finally:
-            client_socket.close()
+    def process_message(self, message):
+        # Simulate message processing delay
+        time.sleep(random.uniform(0.1, 0.5))
+        super().process_message(message)
             
     def send_message(self, target_id, message_type, timestamp=None, retry_count=0):
         if timestamp is None:
@@ -40,35 +30,29 @@ class ReliableNode(SocketNode):
                 self.failed_nodes.add(target_id)
             return False
             
-        for node_id, host, port in self.other_nodes:
-            if node_id == target_id:
-                try:
-                    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    client_socket.settimeout(self.timeout_duration)
-                    client_socket.connect((host, port))
-                    
-                    message = {
-                        'type': message_type.value,
-                        'from_id': self.id,
-                        'timestamp': timestamp
-                    }
-                    
-                    client_socket.send(json.dumps(message).encode('utf-8'))
-                    client_socket.close()
-                    
-                    print(f"Node {self.id} -> Node {target_id}: {message_type.value} sent")
-                    return True
-                    
-                except socket.timeout:
-                    print(f"Node {self.id} -> Node {target_id}: TIMEOUT")
-                    self.failed_nodes.add(target_id)
-                    return False
-                except Exception as e:
-                    print(f"Node {self.id} -> Node {target_id}: Error - {e}")
-                    self.failed_nodes.add(target_id)
-                    return False
-                break
-        return False
+        if target_id not in self.connections.addresses:
+            return False
+            
+        message = {
+            'type': message_type.value,
+            'from_id': self.id,
+            'timestamp': timestamp
+        }
+        
+        try:
+            # Queue on the persistent connection and wait until it is written
+            self.connections.send_message(target_id, message).result()
+            print(f"Node {self.id} -> Node {target_id}: {message_type.value} sent")
+            return True
+            
+        except socket.timeout:
+            print(f"Node {self.id} -> Node {target_id}: TIMEOUT")
+            self.failed_nodes.add(target_id)
+            return False
+        except Exception as e:
+            print(f"Node {self.id} -> Node {target_id}: Error - {e}")
+            self.failed_nodes.add(target_id)
+            return False
         
     def request_critical_section(self):
         self.requesting_cs = True
@@ -1,8 +1,9 @@
 import socket
 import threading
-import json
 import time
 from RicartAgrawalaAlgorithmBasicNode import BasicNode, MessageType
+from peer_connections import ConnectionPool
+from wire import read_messages
 
 class SocketNode(BasicNode):
     def __init__(self, id, port, other_nodes):
@@ -12,6 +13,9 @@ class SocketNode(BasicNode):
         self.socket = None
         self.running = True
         self.replies_received = 0
+        # Persistent connections to the other nodes, opened on first use
+        self.connections = ConnectionPool({node_id: (host, port) for node_id, host, port in other_nodes},
+                                          sender_key='from_id')
         
     def start(self):
         # Start server socket
@@ -38,15 +42,25 @@ class SocketNode(BasicNode):
                 break
                 
     def handle_message(self, client_socket):
+        # Peers keep their connection open: read messages until it is closed.
+        # Each message is processed in its own thread, as when every message had
+        # its own connection, so a handler that sleeps (in the critical section
+        # or a simulated delay) does not stop this reader
         try:
-            data = client_socket.recv(1024).decode('utf-8')
-            if data:
-                message = json.loads(data)
-                self.process_message(message)
+            for message in read_messages(client_socket, 'from_id'):
+                message_thread = threading.Thread(target=self.dispatch_message, args=(message,))
+                message_thread.daemon = True
+                message_thread.start()
         except Exception as e:
             print(f"Node {self.id} error handling message: {e}")
         finally:
             client_socket.close()
+
+    def dispatch_message(self, message):
+        try:
+            self.process_message(message)
+        except Exception as e:
+            print(f"Node {self.id} error handling message: {e}")
             
     def process_message(self, message):
         self.logical_clock = max(self.logical_clock, message['timestamp']) + 1
@@ -77,24 +91,17 @@ class SocketNode(BasicNode):
         if timestamp is None:
             timestamp = self.logical_clock
             
-        for node_id, host, port in self.other_nodes:
-            if node_id == target_id:
-                try:
-                    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    client_socket.connect((host, port))
-                    
-                    message = {
-                        'type': message_type.value,
-                        'from_id': self.id,
-                        'timestamp': timestamp
-                    }
-                    
-                    client_socket.send(json.dumps(message).encode('utf-8'))
-                    client_socket.close()
-                    
-                except Exception as e:
-                    print(f"Error sending message to Node {target_id}: {e}")
-                break
+        message = {
+            'type': message_type.value,
+            'from_id': self.id,
+            'timestamp': timestamp
+        }
+        
+        try:
+            # Queue on the persistent connection and wait until it is written
+            self.connections.send_message(target_id, message).result()
+        except Exception as e:
+            print(f"Error sending message to Node {target_id}: {e}")
                 
     def send_reply(self, target_id):
         print(f"Node {self.id} sending REPLY to Node {target_id}")
@@ -119,6 +126,7 @@ class SocketNode(BasicNode):
         
     def stop(self):
         self.running = False
+        self.connections.close()
         if self.socket:
             self.socket.close()
 
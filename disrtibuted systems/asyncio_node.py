@@ -0,0 +1,350 @@
+"""
+Ricart-Agrawala Mutual Exclusion on asyncio
+===========================================
+
+Single-threaded version of mutualexclusion.Node: every node runs on one
+asyncio event loop instead of a listener thread, a thread per accepted
+connection and a thread per outgoing message.
+1. asyncio.start_server accepts peer connections; each connection is read
+   by a coroutine until the peer closes it
+2. One persistent StreamWriter per peer, opened on first use and re-opened
+   if it breaks
+3. Messages use the framed codec from wire.py; BATCH frames from batching
+   peers are unpacked into their messages
+4. REQUEST broadcasts and deferred replies are sent concurrently with
+   asyncio.gather, and retries wait with asyncio.sleep
+
+Because all handlers run on the same loop, the algorithm state is only ever
+touched by one coroutine at a time and needs no locks. Many nodes can share
+one loop, which makes simulating hundreds of nodes cheap.
+"""
+
+import asyncio
+import random
+
+import wire
+
+
+async def read_messages(reader, sender_key='sender_id'):
+    """
+    Read one frame from a stream and decode the messages in it.
+
+    Args:
+        reader (asyncio.StreamReader): Stream of frames from a peer
+        sender_key (str): Name of the sender ID field
+
+    Returns:
+        list: The decoded messages (several for a BATCH frame, each carrying
+              the batch's Lamport clock as 'clock'), or None if the peer
+              closed the connection
+    """
+    try:
+        header = await reader.readexactly(wire.LENGTH.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ConnectionError("Connection closed inside a frame header")
+        return None
+    (length,) = wire.LENGTH.unpack(header)
+    if length > wire.MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the maximum frame size")
+    payload = await reader.readexactly(length)
+    return wire.decode_messages(payload, sender_key)
+
+
+class AsyncNode:
+    """
+    A Ricart-Agrawala node driven by an asyncio event loop.
+
+    Same protocol and statistics as mutualexclusion.Node; the public methods
+    are coroutines.
+    """
+
+    def __init__(self, node_id, port, peers, host='localhost'):
+        """
+        Initialize a node in the distributed system.
+
+        Args:
+            node_id (int): Unique identifier for this node
+            port (int): Port number for this node's server
+            peers (dict): Dictionary mapping peer node IDs to their port numbers
+            host (str): Host name all nodes listen on
+        """
+        self.id = node_id
+        self.port = port
+        self.peers = peers
+        self.host = host
+
+        # Ricart-Agrawala algorithm state variables
+        self.logical_clock = 0
+        self.in_critical_section = False
+        self.requesting_cs = False
+        self.request_timestamp = None
+        self.deferred_replies = []          # Nodes waiting for our reply
+        self.pending_replies = set()        # Nodes we're waiting replies from
+        self.all_replies = None             # asyncio.Event set when pending_replies empties
+
+        # Message reliability features
+        self.max_retries = 3
+        self.retry_delay = 1.0
+        self.connect_timeout = 5.0
+        self.failure_rate = 0.0             # Simulated message failure rate
+
+        self.stats = {
+            'cs_entries': 0,
+            'messages_sent': 0,
+            'messages_failed': 0,
+            'messages_retried': 0,
+            'deferred_replies': 0
+        }
+
+        self.server = None
+        self.writers = {}                   # Persistent connections: peer ID -> StreamWriter
+        self.connect_locks = {}             # Peer ID -> asyncio.Lock guarding connect
+        self.readers = set()                # Tasks reading accepted connections
+        self.senders = set()                # REPLY tasks started by message handlers
+
+    async def start(self):
+        """Start accepting peer connections on this node's port."""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Read and process messages from one peer connection until it is closed.
+        """
+        self.readers.add(asyncio.current_task())
+        try:
+            while True:
+                messages = await read_messages(reader)
+                if messages is None:
+                    break
+                for message in messages:
+                    self.process_message(message)
+        except (ConnectionError, ValueError) as e:
+            print(f"Node {self.id}: Error reading from peer connection: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.readers.discard(asyncio.current_task())
+            writer.close()
+
+    def process_message(self, message):
+        """
+        Process an incoming REQUEST or REPLY message.
+
+        Args:
+            message (dict): Message with type, sender_id and optional timestamp
+        """
+        msg_type = message['type']
+        sender_id = message['sender_id']
+        timestamp = message.get('timestamp', 0)
+
+        # Update logical clock according to Lamport's algorithm; messages from a
+        # batch also carry the sender's clock
+        self.logical_clock = max(self.logical_clock, timestamp, message.get('clock', 0)) + 1
+
+        if msg_type == 'REQUEST':
+            self.handle_request(sender_id, timestamp)
+        elif msg_type == 'REPLY':
+            self.handle_reply(sender_id)
+
+    def handle_request(self, sender_id, sender_timestamp):
+        """
+        Reply to a CS request now, or defer it if our own request has priority.
+
+        Args:
+            sender_id (int): ID of the node requesting CS access
+            sender_timestamp (int): Logical timestamp of the request
+        """
+        should_defer = (
+            self.in_critical_section or
+            (self.requesting_cs and
+             (self.request_timestamp, self.id) < (sender_timestamp, sender_id))
+        )
+        if should_defer:
+            self.deferred_replies.append(sender_id)
+            self.stats['deferred_replies'] += 1
+        else:
+            # The loop only keeps a weak reference to tasks, so hold on to it
+            task = asyncio.create_task(self.send_reply(sender_id))
+            self.senders.add(task)
+            task.add_done_callback(self.senders.discard)
+
+    def handle_reply(self, sender_id):
+        """
+        Record a REPLY and wake up the waiting request once all are in.
+
+        Args:
+            sender_id (int): ID of the node sending the reply
+        """
+        if sender_id in self.pending_replies:
+            self.pending_replies.remove(sender_id)
+            if not self.pending_replies and self.requesting_cs:
+                self.all_replies.set()
+
+    async def get_writer(self, target_id):
+        """Return the persistent connection to a peer, opening it if needed."""
+        lock = self.connect_locks.setdefault(target_id, asyncio.Lock())
+        async with lock:
+            writer = self.writers.get(target_id)
+            if writer is None or writer.is_closing():
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.peers[target_id]),
+                    self.connect_timeout)
+                self.writers[target_id] = writer
+            return writer
+
+    async def send_message(self, target_id, message):
+        """
+        Send one framed message to a peer over its persistent connection.
+
+        Args:
+            target_id (int): ID of the target node
+            message (dict): Message to send
+
+        Returns:
+            bool: True if the message was written, False otherwise
+        """
+        if random.random() < self.failure_rate:
+            self.stats['messages_failed'] += 1
+            return False
+        data = wire.encode(message)
+        # A kept-alive connection may have been closed by the peer, so a failed
+        # write on it reconnects and tries once more
+        for attempt in range(2):
+            try:
+                writer = await self.get_writer(target_id)
+                writer.write(data)
+                await writer.drain()
+                self.stats['messages_sent'] += 1
+                return True
+            except (OSError, asyncio.TimeoutError) as e:
+                writer = self.writers.pop(target_id, None)
+                if writer is not None:
+                    writer.close()
+                if attempt == 1:
+                    print(f"Node {self.id}: Failed to send to Node {target_id}: {e or type(e).__name__}")
+        self.stats['messages_failed'] += 1
+        return False
+
+    async def send_message_with_retry(self, target_id, message):
+        """
+        Send a message, retrying up to max_retries times.
+
+        Returns:
+            bool: True if the message was eventually sent, False otherwise
+        """
+        for attempt in range(self.max_retries):
+            if await self.send_message(target_id, message):
+                return True
+            self.stats['messages_retried'] += 1
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(self.retry_delay)
+        print(f"Node {self.id}: Failed to send message to Node {target_id} after {self.max_retries} attempts")
+        return False
+
+    async def send_reply(self, target_id):
+        """Send a REPLY granting CS permission to another node."""
+        await self.send_message_with_retry(target_id, {'type': 'REPLY', 'sender_id': self.id})
+
+    async def request_critical_section(self):
+        """
+        Request the critical section and wait until it is granted.
+
+        Sends REQUEST to all peers concurrently and returns once a REPLY has
+        arrived from every one of them, with the node inside the critical
+        section. Does nothing if the node is already requesting or inside.
+
+        Returns:
+            bool: True if the node entered the critical section
+        """
+        if self.in_critical_section or self.requesting_cs:
+            return False
+
+        self.logical_clock += 1
+        self.request_timestamp = self.logical_clock
+        self.requesting_cs = True
+        self.pending_replies = set(self.peers)
+        self.all_replies = asyncio.Event()
+        if not self.pending_replies:
+            self.all_replies.set()
+
+        message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': self.request_timestamp}
+        await asyncio.gather(*(self.send_message_with_retry(peer_id, message) for peer_id in self.peers))
+        await self.all_replies.wait()
+
+        self.requesting_cs = False
+        self.in_critical_section = True
+        self.stats['cs_entries'] += 1
+        return True
+
+    async def exit_critical_section(self):
+        """Leave the critical section and send all deferred replies concurrently."""
+        self.in_critical_section = False
+        deferred, self.deferred_replies = self.deferred_replies, []
+        await asyncio.gather(*(self.send_reply(node_id) for node_id in deferred))
+
+    async def run_critical_section(self, duration=0.0):
+        """Request the critical section, hold it for `duration` seconds, then exit."""
+        if await self.request_critical_section():
+            await asyncio.sleep(duration)
+            await self.exit_critical_section()
+
+    def get_statistics(self):
+        """
+        Get a copy of the node's performance statistics.
+
+        Returns:
+            dict: Copy of statistics dictionary with performance metrics
+        """
+        return self.stats.copy()
+
+    async def shutdown(self):
+        """Stop the server and close all peer connections."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+        for task in list(self.readers) + list(self.senders):
+            task.cancel()
+
+
+async def test_algorithm(num_nodes=30, base_port=7000, rounds=3):
+    """
+    Run num_nodes nodes on one event loop, each entering the critical
+    section `rounds` times with all of them contending at once, and check
+    that no two nodes are ever inside together. Every node keeps a connection
+    to every peer, so this needs about 2 * N * (N - 1) open file descriptors.
+    """
+    ports = {i: base_port + i for i in range(1, num_nodes + 1)}
+    nodes = {i: AsyncNode(i, port, {j: p for j, p in ports.items() if j != i})
+             for i, port in ports.items()}
+    for node in nodes.values():
+        await node.start()
+
+    inside = []
+
+    async def worker(node):
+        for _ in range(rounds):
+            await node.request_critical_section()
+            inside.append(node.id)
+            assert len(inside) == 1, f"Nodes {inside} are in the critical section together"
+            await asyncio.sleep(0.001)
+            inside.remove(node.id)
+            await node.exit_critical_section()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(worker(node) for node in nodes.values()))
+    elapsed = loop.time() - start
+
+    entries = sum(node.stats['cs_entries'] for node in nodes.values())
+    messages = sum(node.stats['messages_sent'] for node in nodes.values())
+    print(f"{num_nodes} nodes, {entries} CS entries, {messages} messages in {elapsed:.2f} sec")
+    for node in nodes.values():
+        await node.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(test_algorithm())
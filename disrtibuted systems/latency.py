@@ -0,0 +1,130 @@
+"""
+Latency Histograms
+==================
+
+HDR-style histogram for the timing statistics of the mutual-exclusion nodes.
+
+Values are counted in log-linear buckets: every power of two is split into the
+same number of linear sub-buckets, so the relative error of a reported value
+is bounded (below 1% with the default 2 significant digits) from microseconds
+to hours, while memory only grows with the number of distinct buckets used.
+Recording is O(1) and histograms from many nodes can be merged.
+"""
+
+import math
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in seconds.
+    """
+
+    def __init__(self, resolution=1e-6, significant_digits=2):
+        """
+        Args:
+            resolution (float): Smallest distinguishable duration in seconds
+            significant_digits (int): Decimal digits kept for every value
+        """
+        self.resolution = resolution
+        self.significant_digits = significant_digits
+        # 2 ** sub_bits linear buckets below the first power-of-two split
+        self.sub_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.half = 1 << (self.sub_bits - 1)
+
+        self.counts = {}                    # Bucket index -> number of values
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket(self, units):
+        """Index of the bucket holding a value of `units` resolution steps."""
+        shift = max(0, units.bit_length() - self.sub_bits)
+        return (shift << (self.sub_bits - 1)) + (units >> shift)
+
+    def bucket_value(self, index):
+        """Midpoint in seconds of the values counted in a bucket."""
+        if index < 2 * self.half:
+            return index * self.resolution
+        shift = index // self.half - 1
+        sub = index - shift * self.half
+        low = sub << shift
+        return (low + ((1 << shift) - 1) / 2) * self.resolution
+
+    def record(self, seconds):
+        """
+        Add one duration to the histogram.
+
+        Args:
+            seconds (float): Duration; negative values are counted as 0
+        """
+        seconds = max(0.0, seconds)
+        index = self.bucket(int(seconds / self.resolution))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """
+        Add all values of another histogram with the same resolution.
+
+        Args:
+            other (LatencyHistogram): Histogram to add
+        """
+        if (other.resolution, other.significant_digits) != (self.resolution, self.significant_digits):
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def mean(self):
+        """Exact mean of the recorded durations (0.0 if empty)."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """
+        Duration below or at which `pct` percent of the values lie.
+
+        Args:
+            pct (float): Percentile between 0 and 100
+
+        Returns:
+            float: Value in seconds, within the histogram's precision
+                   (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Never report beyond the exact extremes
+                return min(max(self.bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, mean, p50, p90, p99 and max in seconds
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max or 0.0
+        }
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,352 @@
+"""
+Distributed Mutual Exclusion using Maekawa's Algorithm
+======================================================
+
+Quorum-based alternative to the Ricart-Agrawala node in mutualexclusion.py,
+with the same public API. Instead of asking every peer, a node asks only its
+quorum: the nodes in its row and column when all nodes are laid out on a
+sqrt(N) x sqrt(N) grid. Any two quorums share at least one node, and every
+node votes for one request at a time, so two nodes can never collect all
+their votes together. A quorum has about 2 * sqrt(N) members, and one CS
+entry costs three messages per member (REQUEST, vote, RELEASE) instead of
+the 2(N-1) messages of Ricart-Agrawala.
+
+Messages:
+- REQUEST: ask a quorum member for its vote
+- REPLY: the vote (called LOCKED in the literature)
+- RELEASE: give the vote back after leaving the CS
+- FAILED: the request is queued behind one with higher priority
+- INQUIRE: ask the node holding our vote whether it can give it back,
+  because a higher-priority request is waiting
+- RELINQUISH: return a vote on INQUIRE (called YIELD in the literature)
+
+The INQUIRE / RELINQUISH exchange breaks the circular waits that plain
+voting can run into: a node that knows it cannot win yet (it has received
+FAILED) hands its votes to higher-priority requests.
+Priority is the (Lamport timestamp, node ID) pair, lower first.
+"""
+
+import heapq
+import math
+import time
+from collections import deque
+
+from mutualexclusion import Node
+
+
+def grid_quorums(node_ids):
+    """
+    Build a grid quorum for every node.
+
+    Node IDs are laid out row by row on a k x k grid with k = ceil(sqrt(N));
+    cells past the last node wrap around to the first nodes. A node's quorum
+    is every node in its row and its column. Quorums of nodes at (r1, c1) and
+    (r2, c2) both contain cell (r1, c2), so any two of them intersect.
+
+    Args:
+        node_ids (iterable): IDs of all nodes in the system
+
+    Returns:
+        dict: Mapping of node ID to the set of node IDs in its quorum
+              (including the node itself)
+    """
+    ids = sorted(node_ids)
+    n = len(ids)
+    k = math.isqrt(n - 1) + 1 if n else 0
+    quorums = {}
+    for position, node_id in enumerate(ids):
+        row, col = divmod(position, k)
+        cells = [row * k + c for c in range(k)] + [r * k + col for r in range(k)]
+        quorums[node_id] = {ids[cell % n] for cell in cells}
+    return quorums
+
+
+class MaekawaNode(Node):
+    """
+    A node in the distributed system implementing Maekawa's algorithm.
+
+    Every node plays two roles: a requester collecting votes from its quorum,
+    and an arbiter handing out its own vote to the nodes whose quorum it is in.
+    """
+
+    def __init__(self, node_id, port, peers, transport=None):
+        """
+        Initialize a node in the distributed system.
+
+        Args:
+            node_id (int): Unique identifier for this node
+            port (int): Port number for this node's socket server
+            peers (dict): Dictionary mapping peer node IDs to their port numbers
+            transport: Message transport (default: a SocketTransport on `port`)
+        """
+        super().__init__(node_id, port, peers, keep_permissions=False, transport=transport)
+        self.quorum = grid_quorums(list(peers) + [node_id])[node_id]
+
+        # Requester state
+        self.votes = set()                  # Quorum members whose vote we hold
+        self.failed = False                 # Received FAILED for the current request
+        self.pending_inquiries = set()      # Arbiters whose INQUIRE we have not answered
+        self.early_inquiries = set()        # Arbiters whose INQUIRE overtook their vote
+
+        # Arbiter state
+        self.voted_for = None               # (timestamp, node ID) holding our vote
+        self.inquired = False               # INQUIRE sent to the vote holder
+        self.waiting = []                   # Heap of queued (timestamp, node ID) requests
+
+        # Messages to ourselves, handled after the handler that sent them
+        self.local_messages = deque()
+
+        self.stats.update({'inquiries': 0, 'relinquished': 0, 'failed_received': 0})
+
+    def send(self, target_id, message):
+        """
+        Send a message, or queue it locally when we are our own quorum member.
+
+        Args:
+            target_id (int): ID of the target node
+            message (dict): Message to send
+        """
+        if target_id == self.id:
+            self.local_messages.append(message)
+        else:
+            self.queue_message(target_id, message)
+
+    def process_message(self, message):
+        """
+        Process an incoming message from a peer.
+
+        Args:
+            message (dict): Message with type, sender_id and optional timestamp
+        """
+        with self.lock:
+            self.logical_clock = max(self.logical_clock, message.get('timestamp', 0),
+                                     message.get('clock', 0)) + 1
+            self.log(f"Node {self.id} got {message['type']} from Node {message['sender_id']}")
+            self.dispatch(message)
+            self.dispatch_local()
+
+    def dispatch_local(self):
+        """
+        Handle the messages we sent to ourselves (the caller holds self.lock).
+
+        They are queued instead of handled inside send(), so a handler never
+        runs in the middle of another one that has only half updated the state.
+        """
+        while self.local_messages:
+            self.dispatch(self.local_messages.popleft())
+
+    def dispatch(self, message):
+        """Route a message to its handler (the caller holds self.lock)."""
+        sender_id = message['sender_id']
+        timestamp = message.get('timestamp', 0)
+        msg_type = message['type']
+        if msg_type == 'REQUEST':
+            self.handle_request(sender_id, timestamp)
+        elif msg_type == 'RELEASE':
+            self.handle_release(sender_id)
+        elif msg_type == 'RELINQUISH':
+            self.handle_relinquish(sender_id)
+        elif msg_type == 'REPLY':
+            self.handle_reply(sender_id, timestamp)
+        elif msg_type == 'FAILED':
+            self.handle_failed(sender_id)
+        elif msg_type == 'INQUIRE':
+            self.handle_inquire(sender_id, timestamp)
+
+    # ----------------------------- Arbiter role -----------------------------
+
+    def grant_vote(self, request):
+        """Give our vote to a (timestamp, node ID) request."""
+        self.voted_for = request
+        self.inquired = False
+        timestamp, node_id = request
+        self.send(node_id, {'type': 'REPLY', 'sender_id': self.id, 'timestamp': timestamp})
+
+    def grant_next(self):
+        """Vote for the highest-priority queued request, if any."""
+        self.voted_for = None
+        self.inquired = False
+        if self.waiting:
+            self.grant_vote(heapq.heappop(self.waiting))
+
+    def handle_request(self, sender_id, sender_timestamp):
+        """
+        Vote for a request, or queue it and answer with INQUIRE or FAILED.
+
+        Args:
+            sender_id (int): ID of the node requesting CS access
+            sender_timestamp (int): Logical timestamp of the request
+        """
+        request = (sender_timestamp, sender_id)
+        if self.voted_for is None:
+            self.grant_vote(request)
+            return
+        self.stats['deferred_replies'] += 1
+        if request < self.voted_for and (not self.waiting or request < self.waiting[0]):
+            # Higher priority than the current vote holder and everyone queued:
+            # ask the holder to give the vote back
+            if self.waiting:
+                # The previous head of the queue is no longer next in line;
+                # it must learn that, or it keeps its other votes forever
+                self.send(self.waiting[0][1], {'type': 'FAILED', 'sender_id': self.id})
+            if not self.inquired:
+                self.inquired = True
+                self.stats['inquiries'] += 1
+                holder_timestamp, holder_id = self.voted_for
+                self.send(holder_id, {'type': 'INQUIRE', 'sender_id': self.id, 'timestamp': holder_timestamp})
+        else:
+            self.send(sender_id, {'type': 'FAILED', 'sender_id': self.id})
+        heapq.heappush(self.waiting, request)
+
+    def handle_release(self, sender_id):
+        """The vote holder left the CS: vote for the next queued request."""
+        if self.voted_for is not None and self.voted_for[1] == sender_id:
+            self.grant_next()
+
+    def handle_relinquish(self, sender_id):
+        """The vote holder gave our vote back: requeue it and vote for the best request."""
+        if self.voted_for is not None and self.voted_for[1] == sender_id:
+            heapq.heappush(self.waiting, self.voted_for)
+            self.grant_next()
+
+    # ---------------------------- Requester role ----------------------------
+
+    def handle_reply(self, sender_id, timestamp):
+        """
+        Record a vote and enter the CS once the whole quorum has voted.
+
+        Args:
+            sender_id (int): ID of the voting quorum member
+            timestamp (int): Timestamp of the request the vote is for
+        """
+        if not self.requesting_cs or timestamp != self.request_timestamp:
+            return
+        self.votes.add(sender_id)
+        self.pending_replies.discard(sender_id)
+        self.record_round_trip(sender_id)
+        if not self.pending_replies:
+            self.early_inquiries = set()
+            self.enter_critical_section()
+        elif sender_id in self.early_inquiries:
+            # The arbiter already asked for this vote back
+            self.early_inquiries.discard(sender_id)
+            self.handle_inquire(sender_id, timestamp)
+
+    def handle_failed(self, sender_id):
+        """We cannot win yet: give back every vote that has been inquired about."""
+        if not self.requesting_cs:
+            return
+        self.failed = True
+        self.stats['failed_received'] += 1
+        for arbiter_id in list(self.pending_inquiries):
+            self.relinquish(arbiter_id)
+
+    def handle_inquire(self, sender_id, timestamp):
+        """
+        An arbiter wants its vote back for a higher-priority request.
+
+        Args:
+            sender_id (int): ID of the arbiter
+            timestamp (int): Timestamp of the request the vote was given for
+        """
+        if not self.requesting_cs or timestamp != self.request_timestamp:
+            return  # Stale, or we are already in the CS and will RELEASE soon
+        if sender_id not in self.votes:
+            # A retried vote can arrive after the INQUIRE about it, and the
+            # arbiter does not inquire twice: answer once the vote is here
+            self.early_inquiries.add(sender_id)
+            return
+        if self.failed:
+            self.relinquish(sender_id)
+        else:
+            self.pending_inquiries.add(sender_id)
+
+    def relinquish(self, arbiter_id):
+        """Give an arbiter's vote back so it can vote for a higher-priority request."""
+        self.pending_inquiries.discard(arbiter_id)
+        if arbiter_id in self.votes:
+            self.votes.remove(arbiter_id)
+            self.pending_replies.add(arbiter_id)
+            self.stats['relinquished'] += 1
+            self.send(arbiter_id, {'type': 'RELINQUISH', 'sender_id': self.id})
+
+    def request_critical_section(self):
+        """
+        Request access to the critical section from this node's quorum.
+
+        Sends REQUEST to every quorum member and enters once all have voted.
+        If already in CS or requesting CS, the request is ignored.
+        """
+        with self.lock:
+            if self.in_critical_section or self.requesting_cs:
+                return
+            self.logical_clock += 1
+            self.request_timestamp = self.logical_clock
+            self.requesting_cs = True
+            self.request_time = self.transport.now()
+            self.request_sent_at = dict.fromkeys(self.quorum, self.request_time)
+            self.votes = set()
+            self.failed = False
+            self.pending_inquiries = set()
+            self.early_inquiries = set()
+            self.pending_replies = set(self.quorum)
+            self.stats['requests_saved'] += len(self.peers) + 1 - len(self.quorum)
+
+            self.log(f"Node {self.id} requests CS at time {self.request_timestamp} "
+                  f"from quorum {sorted(self.quorum)}")
+            message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': self.request_timestamp}
+            for member in sorted(self.quorum):
+                self.send(member, message)
+            self.dispatch_local()
+
+    def exit_critical_section(self):
+        """Exit the critical section and return every vote with RELEASE."""
+        with self.lock:
+            self.in_critical_section = False
+            votes, self.votes = self.votes, set()
+            self.pending_inquiries = set()
+            for member in sorted(votes):
+                self.send(member, {'type': 'RELEASE', 'sender_id': self.id})
+            self.dispatch_local()
+
+    def print_statistics(self):
+        """Display the node's statistics, including the deadlock-avoidance traffic."""
+        super().print_statistics()
+        print(f"  Quorum Size: {len(self.quorum)}")
+        print(f"  Inquiries Sent: {self.stats['inquiries']}")
+        print(f"  Votes Relinquished: {self.stats['relinquished']}")
+
+
+def test_algorithm():
+    """
+    Run 9 Maekawa nodes (3 x 3 grid, quorums of 5) with all of them
+    requesting the CS at nearly the same time.
+    """
+    print("=" * 60)
+    print("MAEKAWA QUORUM-BASED MUTUAL EXCLUSION TEST")
+    print("=" * 60)
+
+    ports = {i: 5020 + i for i in range(1, 10)}
+    nodes = {i: MaekawaNode(i, port, {j: p for j, p in ports.items() if j != i})
+             for i, port in ports.items()}
+    for node in nodes.values():
+        node.failure_rate = 0.0
+        node.start()
+    time.sleep(1)
+
+    for node in nodes.values():
+        node.request_critical_section()
+        time.sleep(0.05)
+    time.sleep(25)
+
+    for node in nodes.values():
+        node.print_statistics()
+    for node in nodes.values():
+        node.shutdown()
+
+
+if __name__ == "__main__":
+    try:
+        test_algorithm()
+    except KeyboardInterrupt:
+        print("\nTest interrupted by user")
@@ -0,0 +1,162 @@
+"""
+Mutual-Exclusion Benchmark
+==========================
+
+Load generator for the mutual-exclusion nodes. Drives N simulated nodes
+(simulator.py) with Poisson request arrivals at a configurable total rate and
+reports, per algorithm, node count and rate:
+- throughput in critical section entries per second
+- messages and frames (batches of messages for one peer) per entry
+- p50/p99 wait (request -> entering the critical section)
+- p50/p99 synchronization delay (one node leaving -> the next one entering
+  while requests are waiting)
+
+The load is open-loop: a request that arrives while its node is still busy
+is queued at the node and issued as soon as the node leaves the critical
+section, so an overloaded configuration shows up as a growing backlog
+instead of a lower offered rate. All times are virtual seconds, so results
+only depend on the network model and the seed, not on the machine.
+
+Usage:
+    python mutex_benchmark.py --nodes 10 50 --rates 10 100 --duration 20 --output results.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+from latency import LatencyHistogram
+from maekawa import MaekawaNode
+from mutualexclusion import Node
+from simulator import Simulator
+from suzukikasami import SuzukiKasamiNode
+
+# Algorithm name -> (node class, constructor arguments)
+ALGORITHMS = {
+    'ricart_agrawala': (Node, {'keep_permissions': False}),
+    'roucairol_carvalho': (Node, {}),
+    'suzuki_kasami': (SuzukiKasamiNode, {}),
+    'maekawa': (MaekawaNode, {}),
+}
+
+CSV_FIELDS = ['algorithm', 'nodes', 'rate', 'entries', 'throughput', 'messages_per_entry', 'frames_per_entry',
+              'wait_p50_ms', 'wait_p99_ms', 'sync_delay_p50_ms', 'sync_delay_p99_ms',
+              'round_trip_p50_ms', 'backlog', 'violations', 'wall_time_s']
+
+
+def milliseconds(histogram, pct):
+    """Percentile of a histogram in milliseconds, '' if it is empty."""
+    return f"{histogram.percentile(pct) * 1000:.2f}" if histogram.count else ''
+
+
+def run_load(algorithm, num_nodes, rate, duration, cs_duration=0.001,
+             latency=(0.001, 0.01), seed=0, batch_window=0.0):
+    """
+    Run one simulated load test.
+
+    Args:
+        algorithm (str): Key of ALGORITHMS
+        num_nodes (int): Number of nodes
+        rate (float): Total CS requests per second over all nodes
+        duration (float): Virtual seconds of load
+        cs_duration (float): Virtual seconds spent in each critical section
+        latency (tuple): (min, max) one-way message latency in seconds
+        seed (int): Seed for arrivals and latencies
+        batch_window (float): Node.batch_window, seconds to collect messages per peer
+
+    Returns:
+        dict: One CSV_FIELDS result row
+    """
+    node_class, kwargs = ALGORITHMS[algorithm]
+    sim = Simulator(seed=seed, latency=latency)
+    nodes = sim.create_nodes(range(1, num_nodes + 1), node_class, **kwargs)
+    backlog = dict.fromkeys(nodes, 0)       # Requests queued at a busy node
+    node_rate = rate / num_nodes
+
+    def arrive(node):
+        if node.requesting_cs or node.in_critical_section:
+            backlog[node.id] += 1
+        else:
+            node.request_critical_section()
+        sim.schedule(sim.rng.expovariate(node_rate), arrive, node)
+
+    def issue_backlog(node, finish):
+        def finish_and_continue():
+            finish()
+            if backlog[node.id]:
+                backlog[node.id] -= 1
+                sim.schedule(0.0, node.request_critical_section)
+        return finish_and_continue
+
+    for node in nodes.values():
+        node.cs_duration = cs_duration
+        node.batch_window = batch_window
+        node.finish_critical_section = issue_backlog(node, node.finish_critical_section)
+        sim.schedule(sim.rng.expovariate(node_rate), arrive, node)
+
+    started = time.perf_counter()
+    sim.run(until=duration)
+    wall_time = time.perf_counter() - started
+
+    wait, round_trip = LatencyHistogram(), LatencyHistogram()
+    for node in nodes.values():
+        wait.merge(node.latency['wait'])
+        round_trip.merge(node.latency['round_trip'])
+    entries = sum(node.stats['cs_entries'] for node in nodes.values())
+    messages = sum(node.stats['messages_sent'] for node in nodes.values())
+    frames = sum(node.stats['frames_sent'] for node in nodes.values())
+    return {
+        'algorithm': algorithm,
+        'nodes': num_nodes,
+        'rate': rate,
+        'entries': entries,
+        'throughput': f"{entries / duration:.2f}",
+        'messages_per_entry': f"{messages / entries:.2f}" if entries else '',
+        'frames_per_entry': f"{frames / entries:.2f}" if entries else '',
+        'wait_p50_ms': milliseconds(wait, 50),
+        'wait_p99_ms': milliseconds(wait, 99),
+        'sync_delay_p50_ms': milliseconds(sim.sync_delay, 50),
+        'sync_delay_p99_ms': milliseconds(sim.sync_delay, 99),
+        # Suzuki-Kasami has no REQUEST -> REPLY exchange
+        'round_trip_p50_ms': milliseconds(round_trip, 50),
+        'backlog': sum(backlog.values()) + sum(node.requesting_cs for node in nodes.values()),
+        'violations': len(sim.violations),
+        'wall_time_s': f"{wall_time:.2f}",
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the mutual-exclusion algorithms under load")
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--rates', type=float, nargs='+', default=[10, 50, 200],
+                        help="Total CS requests per second")
+    parser.add_argument('--duration', type=float, default=20.0, help="Virtual seconds of load")
+    parser.add_argument('--cs-duration', type=float, default=0.001)
+    parser.add_argument('--latency', type=float, nargs=2, default=[0.001, 0.01],
+                        metavar=('MIN', 'MAX'), help="One-way message latency in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-window', type=float, default=0.0,
+                        help="Seconds a node collects messages for a peer before sending them")
+    parser.add_argument('--output', help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for algorithm in args.algorithms:
+            for num_nodes in args.nodes:
+                for rate in args.rates:
+                    writer.writerow(run_load(algorithm, num_nodes, rate, args.duration,
+                                             args.cs_duration, tuple(args.latency), args.seed,
+                                             args.batch_window))
+                    out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,25 @@ Distributed Mutual Exclusion using Ricart-Agrawala Algorithm
 
 This implementation demonstrates a distributed mutual exclusion algorithm
 using the Ricart-Agrawala algorithm with the following features:
-1. Socket-based message passing between nodes
+1. Socket-based message passing over persistent peer connections
 2. Network delay simulation and failure handling
 3. Message retry logic for reliability
 4. Queue-based deferred reply management
 5. Logical clock synchronization
-6. Statistics tracking for performance analysis
+6. Statistics tracking for performance analysis, with latency histograms
+   of the time from request to entry, the time spent inside and the
+   REQUEST -> REPLY round trips
+7. Roucairol-Carvalho optimization: permissions received from peers are
+   kept until they are given away, so repeated entries by the same node
+   only ask the peers that have requested the CS in the meantime
+8. Pluggable transport: SocketTransport (real sockets, threads and timers)
+   by default, or simulator.SimTransport to run nodes in virtual time
+9. Bounded threads: outgoing messages go through a fixed pool of sender
+   threads with a priority-ordered queue (replies before requests), and
+   retries and CS timeouts are scheduled on one timer wheel thread
+10. Message batching: messages queued for the same peer while its sender is
+    busy (e.g. deferred replies and REQUEST broadcasts under contention) go
+    out in one frame, which also piggybacks the sender's Lamport clock
 
 The Ricart-Agrawala algorithm ensures mutual exclusion in distributed systems
 by requiring all nodes to give permission before a node can enter the critical section.
@@ -20,9 +33,285 @@ import threading
 import time
 import json
 import random
-from queue import Queue
+import functools
+import itertools
+import math
+from queue import Queue, PriorityQueue
 from collections import defaultdict
 
+from latency import LatencyHistogram
+from peer_connections import ConnectionPool
+from wire import read_messages
+
+# Outbound queue priority by message type (lower is sent first). Messages that
+# hand out a permission unblock other nodes, so they go ahead of new requests.
+MESSAGE_PRIORITY = {'REPLY': 0, 'TOKEN': 0, 'RELEASE': 0, 'RELINQUISH': 0}
+DEFAULT_PRIORITY = 1
+
+class TimerWheel:
+    """
+    Hashed timer wheel: one thread runs every delayed call.
+    
+    Time is cut into ticks; a call due in d seconds goes into slot
+    (now + ceil(d / tick)) % slots together with its absolute tick, so delays
+    longer than one turn of the wheel simply wait for later turns. Scheduling
+    is O(1) and no thread exists per pending call. Callbacks run on the wheel
+    thread and must be short; slow work belongs on the sender pool.
+    """
+    
+    def __init__(self, tick=0.01, slots=256):
+        """
+        Args:
+            tick (float): Timer resolution in seconds
+            slots (int): Number of slots in the wheel
+        """
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.current = 0                    # Ticks elapsed since start
+        self.lock = threading.Lock()
+        self.running = False
+    
+    def start(self):
+        """Start the wheel thread."""
+        self.running = True
+        thread = threading.Thread(target=self.run)
+        thread.daemon = True
+        thread.start()
+    
+    def schedule(self, delay, function, *args):
+        """Run function(*args) after at least `delay` seconds."""
+        ticks = max(1, math.ceil(delay / self.tick))
+        with self.lock:
+            due = self.current + ticks
+            self.slots[due % len(self.slots)].append((due, function, args))
+    
+    def run(self):
+        """Advance one tick at a time and run the calls that are due."""
+        next_tick = time.monotonic()
+        while self.running:
+            next_tick += self.tick
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            with self.lock:
+                self.current += 1
+                slot = self.slots[self.current % len(self.slots)]
+                due = [entry for entry in slot if entry[0] <= self.current]
+                slot[:] = [entry for entry in slot if entry[0] > self.current]
+            for _, function, args in due:
+                try:
+                    function(*args)
+                except Exception as e:
+                    print(f"Timer callback {function.__name__} failed: {e}")
+    
+    def stop(self):
+        """Stop the wheel; pending calls are dropped."""
+        self.running = False
+
+
+class SocketTransport:
+    """
+    Real network transport for a Node: a listening socket, persistent peer
+    connections, threads for concurrent work and timers for delays.
+    
+    A transport provides attach, start, send, spawn, call_later, now and
+    shutdown; simulator.SimTransport implements the same methods in virtual time.
+    
+    The number of threads is fixed: a listener, one reader per accepted
+    connection, `senders` sender threads and the timer wheel. Spawned work is
+    queued to a sender thread chosen by its key (the target peer), so
+    messages to one peer are sent one at a time and, within a priority, in
+    the order they were queued.
+    """
+    
+    def __init__(self, port, peers, host='localhost', senders=4):
+        """
+        Args:
+            port (int): Port number for this node's socket server
+            peers (dict): Dictionary mapping peer node IDs to their port numbers
+            host (str): Host name all nodes listen on
+            senders (int): Number of sender threads
+        """
+        self.node = None
+        self.port = port
+        
+        # Network socket setup for inter-node communication
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, self.port))
+        self.socket.listen(3)  # Allow up to 3 pending connections
+        
+        # Persistent outgoing connections to every peer, opened on first use
+        self.connections = ConnectionPool({peer_id: (host, peer_port)
+                                           for peer_id, peer_port in peers.items()})
+        self.client_sockets = []            # Accepted connections, closed on shutdown
+        self.running = True
+        
+        # Sender pool: one priority queue of (priority, sequence, function, args) per thread
+        self.outbound = [PriorityQueue() for _ in range(senders)]
+        self.sequence = itertools.count()   # FIFO order within a priority
+        self.timers = TimerWheel()
+    
+    def attach(self, node):
+        """Deliver incoming messages to this node."""
+        self.node = node
+        node.log(f"Node {node.id} started on port {self.port}")
+    
+    def start(self):
+        """
+        Start the node's message listener, sender and timer threads.
+        
+        Creates a daemon thread that continuously listens for incoming
+        messages from other nodes in the distributed system.
+        """
+        listener_thread = threading.Thread(target=self.listen_for_messages)
+        listener_thread.daemon = True  # Thread will exit when main program exits
+        listener_thread.start()
+        
+        for queue in self.outbound:
+            sender_thread = threading.Thread(target=self.run_sender, args=(queue,))
+            sender_thread.daemon = True
+            sender_thread.start()
+        self.timers.start()
+    
+    def listen_for_messages(self):
+        """
+        Continuously accept incoming peer connections.
+        
+        This method runs in a separate thread. Peers keep their connection
+        open, so each accepted connection gets one long-lived reader thread
+        (see handle_connection) instead of being closed after one message.
+        """
+        while self.running:
+            try:
+                # Accept incoming connection from a peer node
+                client_socket, addr = self.socket.accept()
+                self.client_sockets.append(client_socket)
+                reader_thread = threading.Thread(target=self.handle_connection, args=(client_socket,))
+                reader_thread.daemon = True
+                reader_thread.start()
+                
+            except socket.error as e:
+                if self.running:  # Only log errors if not shutting down
+                    self.node.log(f"Node {self.node.id}: Socket error in listener: {e}")
+    
+    def handle_connection(self, client_socket):
+        """
+        Read and process messages from one peer connection until it is closed.
+        
+        Args:
+            client_socket (socket.socket): Accepted connection from a peer node
+        """
+        node = self.node
+        try:
+            for message in read_messages(client_socket):
+                node.process_message(message)
+        except (ValueError, json.JSONDecodeError):
+            node.log(f"Node {node.id}: Received invalid message")
+        except socket.error as e:
+            if self.running:
+                node.log(f"Node {node.id}: Socket error in connection reader: {e}")
+        except Exception as e:
+            if self.running:
+                node.log(f"Node {node.id}: Error in message reader: {e}")
+        finally:
+            client_socket.close()
+    
+    def send(self, target_id, messages, clock):
+        """
+        Send messages to another node in one frame, with failure simulation
+        and network delays (once per frame, like one packet).
+        
+        This method simulates real-world network conditions including:
+        - Random network delays (0.1-0.5 seconds)
+        - Network failures (node.failure_rate, 20% by default)
+        - Connection timeouts
+        - Connection refused errors
+        
+        Args:
+            target_id (int): ID of the target node
+            messages (list): Messages to send (JSON serializable)
+            clock (int): Sender's Lamport clock, piggybacked on the frame
+            
+        Returns:
+            bool: True if the frame was sent successfully, False otherwise
+        """
+        node = self.node
+        # Simulate network latency with random delay
+        time.sleep(random.uniform(0.1, 0.5))
+        
+        # Simulate network failure
+        if random.random() < node.failure_rate:
+            node.log(f"Node {node.id}: Message to Node {target_id} FAILED! (network failure)")
+            return False
+        
+        try:
+            # Queue the frame on the persistent connection to the target node
+            # and wait until it is written (connect/send timeout is 5 seconds)
+            self.connections.send_batch(target_id, messages, clock).result()
+            return True
+            
+        except socket.timeout:
+            node.log(f"Node {node.id}: Timeout sending to Node {target_id}")
+            return False
+        except ConnectionRefusedError:
+            node.log(f"Node {node.id}: Node {target_id} is not reachable")
+            return False
+        except Exception as e:
+            node.log(f"Node {node.id}: Failed to send to Node {target_id}: {e}")
+            return False
+    
+    def run_sender(self, queue):
+        """
+        Run queued work, highest priority first, until shutdown.
+        
+        Args:
+            queue (PriorityQueue): This sender thread's queue
+        """
+        while True:
+            _, _, function, args = queue.get()
+            if function is None:
+                return
+            try:
+                function(*args)
+            except Exception as e:
+                self.node.log(f"Node {self.node.id}: Error in sender thread: {e}")
+    
+    def spawn(self, function, *args, key=None, priority=DEFAULT_PRIORITY):
+        """
+        Queue function(*args) on the sender pool.
+        
+        Args:
+            key: Work with the same key runs on the same sender thread
+            priority (int): Lower runs first among work waiting on that thread
+        """
+        queue = self.outbound[hash(key) % len(self.outbound)]
+        queue.put((priority, next(self.sequence), function, args))
+    
+    def call_later(self, delay, function, *args):
+        """Run function(*args) on the timer wheel after `delay` seconds."""
+        self.timers.schedule(delay, function, *args)
+    
+    def now(self):
+        """Current time in seconds."""
+        return time.monotonic()
+    
+    def shutdown(self):
+        """Stop all threads and close the server socket and all peer connections."""
+        self.running = False
+        self.timers.stop()
+        for queue in self.outbound:
+            queue.put((-1, next(self.sequence), None, None))  # Ahead of any queued work
+        self.connections.close()
+        for client_socket in self.client_sockets:
+            try:
+                client_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        try:
+            self.socket.close()
+        except:
+            pass  # Ignore errors during shutdown
+
+
 class Node:
     """
     Represents a node in the distributed system implementing Ricart-Agrawala algorithm.
@@ -32,7 +321,7 @@ class Node:
     to order requests and ensure fairness.
     """
     
-    def __init__(self, node_id, port, peers):
+    def __init__(self, node_id, port, peers, keep_permissions=True, transport=None):
         """
         Initialize a node in the distributed system.
         
@@ -40,10 +329,14 @@ class Node:
             node_id (int): Unique identifier for this node
             port (int): Port number for this node's socket server
             peers (dict): Dictionary mapping peer node IDs to their port numbers
+            keep_permissions (bool): Use the Roucairol-Carvalho optimization
+                                     (False gives plain Ricart-Agrawala)
+            transport: Message transport (default: a SocketTransport on `port`)
         """
         self.id = node_id
         self.port = port
         self.peers = peers
+        self.keep_permissions = keep_permissions
         
         # Ricart-Agrawala algorithm state variables
         self.logical_clock = 0              # Lamport logical clock
@@ -54,71 +347,57 @@ class Node:
         # Queue management for deferred replies
         self.deferred_replies = Queue()     # Queue of nodes waiting for replies
         self.pending_replies = set()        # Set of nodes we're waiting replies from
+        self.permissions = set()            # Peers whose REPLY we still hold (Roucairol-Carvalho)
+        
+        # Connection reader threads and the requesting thread share the state above
+        self.lock = threading.RLock()
         
         # Message reliability features
         self.max_retries = 3                # Maximum retry attempts for failed messages
         self.retry_delay = 1.0              # Delay between retry attempts (seconds)
+        self.cs_duration = 2.0              # Simulated work in the critical section (seconds)
+        self.batch_window = 0.0             # Extra wait to batch messages per peer (seconds)
+        self.outbox = {}                    # Peer ID -> [(message, attempt)] for the next frame
+        self.verbose = True                 # Print protocol events
         
         # Performance statistics tracking
         self.stats = {
             'cs_entries': 0,        # Number of times this node entered CS
             'messages_sent': 0,     # Total messages sent (successful)
             'messages_failed': 0,   # Total messages that failed
+            'frames_sent': 0,       # Frames (batches of messages) sent
             'messages_retried': 0,  # Total retry attempts
-            'deferred_replies': 0   # Total replies deferred
+            'deferred_replies': 0,  # Total replies deferred
+            'requests_saved': 0     # REQUESTs not sent thanks to kept permissions
         }
         
-        # Network socket setup for inter-node communication
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind(('localhost', self.port))
-        self.socket.listen(3)  # Allow up to 3 pending connections
+        # Timing of every request, in seconds of transport time (transport.now)
+        self.latency = {
+            'wait': LatencyHistogram(),         # Request -> entering the CS
+            'hold': LatencyHistogram(),         # Entering -> leaving the CS
+            'round_trip': LatencyHistogram()    # REQUEST sent -> REPLY received
+        }
+        self.request_time = None            # When the current request was made
+        self.enter_time = None              # When we last entered the CS
+        self.request_sent_at = {}           # Peer ID -> when we sent it our REQUEST
         
         # Network failure simulation parameters
         self.failure_rate = 0.2  # 20% chance of message failure
         
-        self.running = True
-        print(f"Node {self.id} started on port {self.port}")
+        # Sockets and threads, or a simulated network
+        self.transport = transport if transport is not None else SocketTransport(port, peers)
+        self.transport.attach(self)
     
-    def start(self):
-        """
-        Start the node's message listener thread.
-        
-        Creates a daemon thread that continuously listens for incoming
-        messages from other nodes in the distributed system.
-        """
-        listener_thread = threading.Thread(target=self.listen_for_messages)
-        listener_thread.daemon = True  # Thread will exit when main program exits
-        listener_thread.start()
+    def log(self, text):
+        """Print a protocol event unless the node is quiet (verbose=False)."""
+        if self.verbose:
+            print(text)
     
-    def listen_for_messages(self):
+    def start(self):
         """
-        Continuously listen for incoming socket connections and process messages.
-        
-        This method runs in a separate thread and handles all incoming
-        communication from peer nodes. It processes REQUEST and REPLY messages
-        according to the Ricart-Agrawala protocol.
+        Start receiving messages from other nodes through the transport.
         """
-        while self.running:
-            try:
-                # Accept incoming connection from a peer node
-                client_socket, addr = self.socket.accept()
-                
-                # Receive and decode the JSON message
-                data = client_socket.recv(1024).decode()
-                if data:
-                    message = json.loads(data)
-                    self.process_message(message)
-                client_socket.close()
-                
-            except socket.error as e:
-                if self.running:  # Only log errors if not shutting down
-                    print(f"Node {self.id}: Socket error in listener: {e}")
-            except json.JSONDecodeError:
-                print(f"Node {self.id}: Received invalid JSON message")
-            except Exception as e:
-                if self.running:
-                    print(f"Node {self.id}: Error in message listener: {e}")
+        self.transport.start()
     
     def process_message(self, message):
         """
@@ -132,16 +411,17 @@ class Node:
         sender_id = message['sender_id']
         timestamp = message.get('timestamp', 0)
         
-        # Update logical clock according to Lamport's algorithm
-        # Clock = max(local_clock, received_timestamp) + 1
-        self.logical_clock = max(self.logical_clock, timestamp) + 1
-        
-        if msg_type == 'REQUEST':
-            print(f"Node {self.id} got REQUEST from Node {sender_id}")
-            self.handle_request(sender_id, timestamp)
-        elif msg_type == 'REPLY':
-            print(f"Node {self.id} got REPLY from Node {sender_id}")
-            self.handle_reply(sender_id)
+        with self.lock:
+            # Update logical clock according to Lamport's algorithm
+            # Clock = max(local_clock, received_timestamp, sender's piggybacked clock) + 1
+            self.logical_clock = max(self.logical_clock, timestamp, message.get('clock', 0)) + 1
+            
+            if msg_type == 'REQUEST':
+                self.log(f"Node {self.id} got REQUEST from Node {sender_id}")
+                self.handle_request(sender_id, timestamp)
+            elif msg_type == 'REPLY':
+                self.log(f"Node {self.id} got REPLY from Node {sender_id}")
+                self.handle_reply(sender_id)
     
     def handle_request(self, sender_id, sender_timestamp):
         """
@@ -156,6 +436,10 @@ class Node:
         - Lower timestamp wins
         - If timestamps are equal, lower node ID wins
         
+        With keep_permissions, replying gives our permission away. If we are
+        requesting ourselves and had kept the sender's permission, we have to
+        ask the sender for it again.
+        
         Args:
             sender_id (int): ID of the node requesting CS access
             sender_timestamp (int): Logical timestamp of the request
@@ -172,10 +456,17 @@ class Node:
             # Defer the reply - add sender to queue for later processing
             self.deferred_replies.put(sender_id)
             self.stats['deferred_replies'] += 1
-            print(f"Node {self.id} defers reply to Node {sender_id}")
+            self.log(f"Node {self.id} defers reply to Node {sender_id}")
         else:
             # Reply immediately - sender can proceed
             self.send_reply(sender_id)
+            if self.keep_permissions and self.requesting_cs and sender_id not in self.pending_replies:
+                # The sender has priority and now holds our permission:
+                # request theirs again for our own pending request
+                self.pending_replies.add(sender_id)
+                self.request_sent_at[sender_id] = self.transport.now()
+                message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': self.request_timestamp}
+                self.queue_message(sender_id, message)
     
     def handle_reply(self, sender_id):
         """
@@ -183,96 +474,111 @@ class Node:
         
         When we receive a reply, we remove that node from our pending replies set.
         If we have received replies from all nodes and we're requesting CS,
-        we can enter the critical section.
+        we can enter the critical section. With keep_permissions the reply is
+        also kept as a permission for later requests.
         
         Args:
             sender_id (int): ID of the node sending the reply
         """
+        if self.keep_permissions:
+            self.permissions.add(sender_id)
         if sender_id in self.pending_replies:
             self.pending_replies.remove(sender_id)
+            self.record_round_trip(sender_id)
             
             # Check if we have all required permissions
             if len(self.pending_replies) == 0 and self.requesting_cs:
                 self.enter_critical_section()
     
-    def send_message(self, target_id, message):
+    def record_round_trip(self, sender_id):
         """
-        Send a message to another node with failure simulation and network delays.
+        Record the time since our REQUEST to a peer whose REPLY just arrived.
         
-        This method simulates real-world network conditions including:
-        - Random network delays (0.1-0.5 seconds)
-        - Network failures (20% failure rate)
-        - Connection timeouts
-        - Connection refused errors
+        Args:
+            sender_id (int): ID of the node sending the reply
+        """
+        sent_at = self.request_sent_at.pop(sender_id, None)
+        if sent_at is not None:
+            self.latency['round_trip'].record(self.transport.now() - sent_at)
+    
+    def send_messages(self, target_id, messages):
+        """
+        Send messages to another node in one frame through the transport.
+        
+        The frame carries our Lamport clock. With the default SocketTransport
+        this includes simulated network delays and failures (see SocketTransport.send).
         
         Args:
             target_id (int): ID of the target node
-            message (dict): Message to send (JSON serializable)
+            messages (list): Messages to send (JSON serializable)
             
         Returns:
-            bool: True if message sent successfully, False otherwise
+            bool: True if the frame was sent successfully, False otherwise
         """
-        # Simulate network latency with random delay
-        time.sleep(random.uniform(0.1, 0.5))
+        if self.transport.send(target_id, messages, self.logical_clock):
+            self.stats['messages_sent'] += len(messages)
+            self.stats['frames_sent'] += 1
+            for message in messages:
+                self.log(f"Node {self.id} sent {message['type']} to Node {target_id}")
+            return True
+        self.stats['messages_failed'] += len(messages)
+        return False
+    
+    def queue_message(self, target_id, message, attempt=0):
+        """
+        Queue a message for a peer; all messages queued for the same peer
+        until the sender pool gets to them go out together in one frame.
         
-        # Simulate network failure
-        if random.random() < self.failure_rate:
-            print(f"Node {self.id}: Message to Node {target_id} FAILED! (network failure)")
-            self.stats['messages_failed'] += 1
-            return False
+        Messages to the same peer share a sender thread, and replies and
+        other permission-granting messages are sent ahead of requests.
+        With batch_window > 0 a peer's frame also waits that long for more
+        messages before it is queued for sending.
         
-        try:
-            # Create socket connection to target node
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5.0)  # 5 second timeout for connection
-            sock.connect(('localhost', self.peers[target_id]))
-            
-            # Send JSON-encoded message
-            sock.send(json.dumps(message).encode())
-            sock.close()
-            
-            self.stats['messages_sent'] += 1
-            print(f"Node {self.id} sent {message['type']} to Node {target_id}")
-            return True
-            
-        except socket.timeout:
-            print(f"Node {self.id}: Timeout sending to Node {target_id}")
-            return False
-        except ConnectionRefusedError:
-            print(f"Node {self.id}: Node {target_id} is not reachable")
-            return False
-        except Exception as e:
-            print(f"Node {self.id}: Failed to send to Node {target_id}: {e}")
-            return False
+        Args:
+            target_id (int): ID of the target node
+            message (dict): Message to send
+            attempt (int): Number of attempts already made
+        """
+        with self.lock:
+            batch = self.outbox.setdefault(target_id, [])
+            batch.append((message, attempt))
+            if len(batch) > 1:
+                return  # Joins the frame already scheduled for this peer
+        priority = MESSAGE_PRIORITY.get(message['type'], DEFAULT_PRIORITY)
+        spawn = functools.partial(self.transport.spawn, key=target_id, priority=priority)
+        if self.batch_window > 0:
+            self.transport.call_later(self.batch_window, spawn, self.flush_messages, target_id)
+        else:
+            spawn(self.flush_messages, target_id)
     
-    def send_message_with_retry(self, target_id, message):
+    def flush_messages(self, target_id):
         """
-        Send message with retry logic for improved reliability.
+        Send the messages queued for a peer, with retry logic for reliability.
         
         Critical messages (like CS requests and replies) are retried multiple times
         to handle temporary network failures and improve system reliability.
+        Retries are scheduled on the transport's timer and then queued again,
+        so no thread sleeps while waiting for the next attempt.
         
         Args:
             target_id (int): ID of the target node
-            message (dict): Message to send
-            
-        Returns:
-            bool: True if message eventually sent successfully, False if all retries failed
         """
-        for attempt in range(self.max_retries):
-            if self.send_message(target_id, message):
-                return True
-                
+        with self.lock:
+            batch = self.outbox.pop(target_id, [])
+        if not batch or self.send_messages(target_id, [message for message, _ in batch]):
+            return
+            
+        for message, attempt in batch:
             # Track retry statistics
             self.stats['messages_retried'] += 1
             
-            # Wait before retrying (except on last attempt)
+            # Retry after a delay (except on last attempt)
             if attempt < self.max_retries - 1:
-                print(f"Node {self.id}: Retrying message to Node {target_id} (attempt {attempt + 2})")
-                time.sleep(self.retry_delay)
-                
-        print(f"Node {self.id}: Failed to send message to Node {target_id} after {self.max_retries} attempts")
-        return False
+                self.log(f"Node {self.id}: Retrying message to Node {target_id} (attempt {attempt + 2})")
+                self.transport.call_later(self.retry_delay, self.queue_message,
+                                          target_id, message, attempt + 1)
+            else:
+                self.log(f"Node {self.id}: Failed to send message to Node {target_id} after {self.max_retries} attempts")
     
     def send_reply(self, target_id):
         """
@@ -284,8 +590,10 @@ class Node:
         Args:
             target_id (int): ID of the node to send the reply to
         """
+        # Replying hands our permission to the target
+        self.permissions.discard(target_id)
         message = {'type': 'REPLY', 'sender_id': self.id}
-        threading.Thread(target=self.send_message_with_retry, args=(target_id, message)).start()
+        self.queue_message(target_id, message)
     
     def request_critical_section(self):
         """
@@ -294,29 +602,42 @@ class Node:
         Protocol steps:
         1. Increment logical clock
         2. Set request timestamp
-        3. Send REQUEST message to all peer nodes
-        4. Wait for REPLY from all peers before entering CS
+        3. Send REQUEST to all peer nodes (with keep_permissions: only to the
+           peers whose permission we do not hold)
+        4. Wait for REPLY from all of them before entering CS
         
-        If already in CS or requesting CS, the request is ignored.
+        If we already hold every permission, the CS is entered without sending
+        any message. If already in CS or requesting CS, the request is ignored.
         """
-        # Prevent multiple simultaneous requests from same node
-        if self.in_critical_section or self.requesting_cs:
-            return
-        
-        # Step 1: Increment logical clock for new request
-        self.logical_clock += 1
-        self.request_timestamp = self.logical_clock
-        self.requesting_cs = True
-        
-        # Step 2: Initialize set of nodes we need replies from
-        self.pending_replies = set(self.peers.keys())
-        
-        print(f"Node {self.id} requests CS at time {self.request_timestamp}")
-        
-        # Step 3: Send REQUEST to all peer nodes with retry logic
-        message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': self.request_timestamp}
-        for peer_id in self.peers:
-            threading.Thread(target=self.send_message_with_retry, args=(peer_id, message)).start()
+        with self.lock:
+            # Prevent multiple simultaneous requests from same node
+            if self.in_critical_section or self.requesting_cs:
+                return
+            
+            # Step 1: Increment logical clock for new request
+            self.logical_clock += 1
+            self.request_timestamp = self.logical_clock
+            self.requesting_cs = True
+            self.request_time = self.transport.now()
+            
+            # Step 2: Initialize set of nodes we need replies from
+            self.pending_replies = set(self.peers.keys())
+            if self.keep_permissions:
+                self.pending_replies -= self.permissions
+                self.stats['requests_saved'] += len(self.peers) - len(self.pending_replies)
+            
+            self.log(f"Node {self.id} requests CS at time {self.request_timestamp}")
+            
+            if not self.pending_replies:
+                # Every permission is still ours: enter without any messages
+                self.enter_critical_section()
+                return
+            
+            # Step 3: Send REQUEST to the peer nodes with retry logic
+            message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': self.request_timestamp}
+            self.request_sent_at = dict.fromkeys(self.pending_replies, self.request_time)
+            for peer_id in self.pending_replies:
+                self.queue_message(peer_id, message)
     
     def enter_critical_section(self):
         """
@@ -326,17 +647,27 @@ class Node:
         have been received. It simulates work in the critical section and
         then automatically exits.
         """
-        self.in_critical_section = True
-        self.requesting_cs = False
-        self.stats['cs_entries'] += 1
-        
-        print(f">>> Node {self.id} ENTERS Critical Section")
-        
-        # Simulate work in critical section
-        time.sleep(2)  # 2 seconds of "critical work"
-        
-        print(f">>> Node {self.id} EXITS Critical Section")
-        
+        with self.lock:
+            self.in_critical_section = True
+            self.requesting_cs = False
+            self.stats['cs_entries'] += 1
+            self.enter_time = self.transport.now()
+            if self.request_time is not None:
+                self.latency['wait'].record(self.enter_time - self.request_time)
+            
+            self.log(f">>> Node {self.id} ENTERS Critical Section")
+            
+        # Simulate work in critical section: exit after cs_duration seconds
+        # (a timer, so incoming requests are still handled and deferred meanwhile)
+        self.transport.call_later(self.cs_duration, self.finish_critical_section)
+    
+    def finish_critical_section(self):
+        """
+        End the simulated work in the critical section and exit it.
+        """
+        with self.lock:
+            self.latency['hold'].record(self.transport.now() - self.enter_time)
+        self.log(f">>> Node {self.id} EXITS Critical Section")
         self.exit_critical_section()
     
     def exit_critical_section(self):
@@ -347,12 +678,13 @@ class Node:
         whose requests we deferred while we were in the critical section.
         This ensures progress and prevents deadlock.
         """
-        self.in_critical_section = False
-        
-        # Send all deferred replies from the queue
-        while not self.deferred_replies.empty():
-            node_id = self.deferred_replies.get()
-            self.send_reply(node_id)
+        with self.lock:
+            self.in_critical_section = False
+            
+            # Send all deferred replies from the queue
+            while not self.deferred_replies.empty():
+                node_id = self.deferred_replies.get()
+                self.send_reply(node_id)
     
     def get_statistics(self):
         """
@@ -363,6 +695,17 @@ class Node:
         """
         return self.stats.copy()
     
+    def get_latency(self):
+        """
+        Get a summary of the node's timing histograms.
+        
+        Returns:
+            dict: 'wait', 'hold' and 'round_trip', each a dict with count,
+                  mean, p50, p90, p99 and max in seconds
+        """
+        with self.lock:
+            return {name: histogram.summary() for name, histogram in self.latency.items()}
+    
     def print_statistics(self):
         """
         Display comprehensive statistics about this node's performance.
@@ -371,32 +714,36 @@ class Node:
         - Number of critical section entries
         - Message transmission statistics
         - Success rates and reliability metrics
+        - Median and 99th percentile wait for the critical section
         """
         print(f"\nNode {self.id} Statistics:")
         print(f"  Critical Section Entries: {self.stats['cs_entries']}")
         print(f"  Messages Sent: {self.stats['messages_sent']}")
         print(f"  Messages Failed: {self.stats['messages_failed']}")
+        print(f"  Frames Sent: {self.stats['frames_sent']}")
         print(f"  Messages Retried: {self.stats['messages_retried']}")
         print(f"  Deferred Replies: {self.stats['deferred_replies']}")
+        print(f"  Requests Saved: {self.stats['requests_saved']}")
         
-        # Calculate and display success rate
-        if self.stats['messages_sent'] > 0:
-            success_rate = ((self.stats['messages_sent'] - self.stats['messages_failed']) / self.stats['messages_sent']) * 100
+        # Calculate and display success rate (failed sends are not counted in messages_sent)
+        attempts = self.stats['messages_sent'] + self.stats['messages_failed']
+        if attempts > 0:
+            success_rate = (self.stats['messages_sent'] / attempts) * 100
             print(f"  Message Success Rate: {success_rate:.1f}%")
+        
+        wait = self.latency['wait']
+        if wait.count:
+            print(f"  CS Wait p50/p99: {wait.percentile(50):.3f}s / {wait.percentile(99):.3f}s")
 
     def shutdown(self):
         """
         Gracefully shutdown the node and close all network connections.
         
-        This method stops the message listener thread and closes the server socket.
-        It's designed to handle shutdown errors gracefully.
+        Stops the transport: with SocketTransport this stops the message
+        listener thread, closes the server socket and all peer connections.
         """
-        print(f"Node {self.id}: Shutting down...")
-        self.running = False
-        try:
-            self.socket.close()
-        except:
-            pass  # Ignore errors during shutdown
+        self.log(f"Node {self.id}: Shutting down...")
+        self.transport.shutdown()
 
 # Enhanced test with better monitoring
 def test_algorithm():
@@ -0,0 +1,170 @@
+"""
+Persistent Peer Connections
+===========================
+
+Long-lived TCP connections between the mutual-exclusion nodes, replacing the
+connect / send one message / close pattern. Every peer gets one connection
+that is opened on first use and kept open afterwards:
+1. Each peer has its own send queue, drained by one writer thread, so
+   messages to the same peer go out in order and never interleave
+2. A broken connection is closed and re-opened once before the send fails
+3. send() returns a Future, so callers can wait for the write or carry on
+4. Messages are framed with wire.encode(), read back with wire.read_messages()
+
+The receiving side keeps each accepted connection open and reads messages
+from it in a loop until the peer closes it.
+"""
+
+import select
+import socket
+import threading
+from concurrent.futures import Future
+from queue import Queue
+
+import wire
+
+
+class PeerConnection:
+    """
+    One persistent connection to a peer, with its own send queue and writer thread.
+    """
+
+    def __init__(self, address, connect_timeout=5.0):
+        """
+        Args:
+            address (tuple): (host, port) of the peer's server socket
+            connect_timeout (float): Timeout for connecting and sending (seconds)
+        """
+        self.address = address
+        self.connect_timeout = connect_timeout
+        self.sock = None
+        self.queue = Queue()
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def send(self, data):
+        """
+        Queue raw bytes for sending to the peer.
+
+        Args:
+            data (bytes): Encoded message
+
+        Returns:
+            Future: Resolves to True once the data is written, or to the
+                    socket exception if the peer could not be reached
+        """
+        future = Future()
+        if self.closed:
+            future.set_exception(ConnectionError("Connection is closed"))
+        else:
+            self.queue.put((data, future))
+        return future
+
+    def _connect(self):
+        sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+
+    def _disconnect(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _peer_closed(self):
+        # Peers never write back on this connection, so a readable socket means
+        # the peer has closed it (EOF or reset)
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        return bool(readable)
+
+    def _write(self, data):
+        if self.sock is not None and self._peer_closed():
+            self._disconnect()
+        # A kept-alive connection may still break while writing, so a failed
+        # write on an existing connection reconnects and tries once more
+        for attempt in range(2):
+            reused = self.sock is not None
+            try:
+                if not reused:
+                    self._connect()
+                self.sock.sendall(data)
+                return
+            except OSError:
+                self._disconnect()
+                if not reused or attempt == 1:
+                    raise
+
+    def _write_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            data, future = item
+            try:
+                self._write(data)
+                future.set_result(True)
+            except Exception as e:
+                future.set_exception(e)
+        self._disconnect()
+
+    def close(self):
+        """Stop the writer thread after the queued messages and close the connection."""
+        if not self.closed:
+            self.closed = True
+            self.queue.put(None)
+
+
+class ConnectionPool:
+    """
+    Persistent connections to all peers of a node, created on first use.
+    """
+
+    def __init__(self, addresses, connect_timeout=5.0, sender_key='sender_id'):
+        """
+        Args:
+            addresses (dict): Mapping of peer node IDs to (host, port) tuples
+            connect_timeout (float): Timeout for connecting and sending (seconds)
+            sender_key (str): Name of the sender ID field in messages (see wire.py)
+        """
+        self.addresses = addresses
+        self.connect_timeout = connect_timeout
+        self.sender_key = sender_key
+        self.connections = {}
+        self.lock = threading.Lock()
+
+    def get(self, peer_id):
+        """Return the connection to a peer, creating it if needed."""
+        with self.lock:
+            connection = self.connections.get(peer_id)
+            if connection is None:
+                connection = PeerConnection(self.addresses[peer_id], self.connect_timeout)
+                self.connections[peer_id] = connection
+            return connection
+
+    def send(self, peer_id, data):
+        """
+        Queue raw bytes for a peer.
+
+        Returns:
+            Future: See PeerConnection.send()
+        """
+        return self.get(peer_id).send(data)
+
+    def send_message(self, peer_id, message):
+        """Encode a message dictionary as a frame and queue it for a peer."""
+        return self.send(peer_id, wire.encode(message, self.sender_key))
+
+    def send_batch(self, peer_id, messages, clock):
+        """Encode several messages as one BATCH frame and queue it for a peer."""
+        return self.send(peer_id, wire.encode_batch(messages, clock, self.sender_key))
+
+    def close(self):
+        """Close the connections to all peers."""
+        with self.lock:
+            connections = list(self.connections.values())
+            self.connections.clear()
+        for connection in connections:
+            connection.close()
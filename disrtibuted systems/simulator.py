@@ -0,0 +1,335 @@
+"""
+Discrete-Event Simulator for the Mutual-Exclusion Nodes
+=======================================================
+
+Runs mutualexclusion.Node and its subclasses (SuzukiKasamiNode, MaekawaNode)
+in one process and in virtual time, without sockets, threads or sleeps:
+1. An event queue ordered by virtual time; running the simulation pops events
+   one by one, so a run is fully deterministic for a given seed
+2. SimTransport, a drop-in replacement for SocketTransport: sends become
+   delivery events (one per frame of batched messages) after a random
+   latency, spawned work and timers
+   (retries, time spent in the critical section) become events too
+3. A seeded network model: uniform latency per message, FIFO delivery per
+   link (like one TCP connection per peer) and a loss rate. A lost message
+   is reported to the sender as a failed send, as in the socket-based
+   failure simulation, so the node's retry logic applies. A retried message
+   can arrive after later messages on the same link, and one that fails all
+   its retries is lost for good, which stalls the nodes waiting for it
+4. A mutual exclusion monitor that records every time two nodes are in the
+   critical section together, and the synchronization delay: the time from
+   one node leaving the critical section to the next one entering it while
+   requests were waiting
+
+Because nothing waits for real time, thousands of nodes and millions of
+messages take seconds instead of the minutes the socket-based tests need.
+
+Scope: only the Node family talks to the network through a transport, so
+only it can be simulated. m.Node, SocketNode/ReliableNode (the Failure
+Handling variant) and AsyncNode still open their own sockets and sleep in
+real time, and their test_algorithm runs are unchanged. Message loss and
+retries, which the Failure Handling variant exercises, are covered here
+through Node's own retry logic and the loss rate of the network model.
+"""
+
+import heapq
+import random
+import time
+
+from latency import LatencyHistogram
+from mutualexclusion import Node
+
+
+class Simulator:
+    """
+    Event queue, virtual clock and network model shared by all simulated nodes.
+    """
+
+    def __init__(self, seed=0, latency=(0.001, 0.01), loss_rate=0.0, verbose=False):
+        """
+        Args:
+            seed (int): Seed for latencies and message loss
+            latency (tuple): (min, max) one-way message latency in seconds
+            loss_rate (float): Probability that a send fails
+            verbose (bool): Let the nodes print their protocol events
+        """
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.loss_rate = loss_rate
+        self.verbose = verbose
+
+        self.time = 0.0                     # Virtual time in seconds
+        self.events = []                    # Heap of (time, sequence, function, args)
+        self.sequence = 0                   # Tie-breaker: same-time events run in FIFO order
+        self.transports = {}                # Node ID -> SimTransport
+        self.link_time = {}                 # (sender, receiver) -> last delivery time
+
+        # Mutual exclusion monitor
+        self.inside = set()                 # Nodes currently in the critical section
+        self.violations = []                # (time, nodes) whenever more than one is inside
+        self.sync_delay = LatencyHistogram()
+        self.handover_time = None           # Last exit while other requests were waiting
+
+        self.stats = {
+            'events': 0,
+            'messages_sent': 0,
+            'frames_sent': 0,
+            'messages_lost': 0,
+            'messages_delivered': 0
+        }
+
+    def schedule(self, delay, function, *args):
+        """Run function(*args) at virtual time now + delay."""
+        self.sequence += 1
+        heapq.heappush(self.events, (self.time + delay, self.sequence, function, args))
+
+    def run(self, until=None, max_events=None):
+        """
+        Process events in time order.
+
+        Args:
+            until (float): Stop before the first event later than this virtual time
+            max_events (int): Stop after this many events
+
+        Returns:
+            int: Number of events processed
+        """
+        events = self.events
+        processed = 0
+        while events and (max_events is None or processed < max_events):
+            if until is not None and events[0][0] > until:
+                break
+            self.time, _, function, args = heapq.heappop(events)
+            function(*args)
+            processed += 1
+        if until is not None and self.time < until:
+            self.time = until
+        self.stats['events'] += processed
+        return processed
+
+    def transport(self, node_id):
+        """Create the simulated transport for one node."""
+        transport = SimTransport(self, node_id)
+        self.transports[node_id] = transport
+        return transport
+
+    def create_nodes(self, node_ids, node_class=Node, **kwargs):
+        """
+        Create, monitor and start a fully connected set of simulated nodes.
+
+        Args:
+            node_ids (iterable): IDs of the nodes
+            node_class (type): Node or a subclass with the same constructor
+            **kwargs: Extra constructor arguments, e.g. keep_permissions=False
+
+        Returns:
+            dict: Mapping of node ID to node
+        """
+        node_ids = list(node_ids)
+        nodes = {}
+        for node_id in node_ids:
+            peers = {peer_id: None for peer_id in node_ids if peer_id != node_id}
+            node = node_class(node_id, None, peers, transport=self.transport(node_id), **kwargs)
+            self.monitor(node)
+            node.start()
+            nodes[node_id] = node
+        return nodes
+
+    def monitor(self, node):
+        """Record entries and exits of a node's critical section."""
+        enter, finish = node.enter_critical_section, node.finish_critical_section
+
+        def monitored_enter():
+            if self.inside:
+                self.violations.append((self.time, sorted(self.inside | {node.id})))
+            self.inside.add(node.id)
+            if self.handover_time is not None:
+                self.sync_delay.record(self.time - self.handover_time)
+                self.handover_time = None
+            enter()
+
+        def monitored_finish():
+            self.inside.discard(node.id)
+            finish()
+            if any(transport.node.requesting_cs for transport in self.transports.values()):
+                self.handover_time = self.time
+
+        node.enter_critical_section = monitored_enter
+        node.finish_critical_section = monitored_finish
+
+    def deliver_time(self, sender_id, target_id):
+        """Arrival time of a message sent now, keeping each link FIFO."""
+        arrival = self.time + self.rng.uniform(*self.latency)
+        link = (sender_id, target_id)
+        arrival = max(arrival, self.link_time.get(link, 0.0))
+        self.link_time[link] = arrival
+        return arrival
+
+
+class SimTransport:
+    """
+    Simulated transport for one node; same methods as mutualexclusion.SocketTransport.
+    """
+
+    def __init__(self, simulator, node_id):
+        self.simulator = simulator
+        self.node_id = node_id
+        self.node = None
+        self.running = False
+
+    def attach(self, node):
+        """Deliver incoming messages to this node."""
+        self.node = node
+        node.verbose = self.simulator.verbose
+
+    def start(self):
+        """Start accepting messages."""
+        self.running = True
+
+    def send(self, target_id, messages, clock):
+        """
+        Send a frame of messages through the simulated network.
+
+        Args:
+            target_id (int): ID of the target node
+            messages (list): Messages, delivered together and in order
+            clock (int): Sender's Lamport clock, piggybacked on every message
+
+        Returns:
+            bool: False if the frame was lost or the target is down,
+                  True if it will be delivered after the link latency
+        """
+        sim = self.simulator
+        target = sim.transports.get(target_id)
+        if target is None or not target.running or not self.running:
+            return False
+        if sim.loss_rate and sim.rng.random() < sim.loss_rate:
+            sim.stats['messages_lost'] += len(messages)
+            return False
+        sim.stats['messages_sent'] += len(messages)
+        sim.stats['frames_sent'] += 1
+        # Copy, so later changes by the sender cannot reach the receiver
+        sim.sequence += 1
+        heapq.heappush(sim.events, (sim.deliver_time(self.node_id, target_id), sim.sequence, target.deliver,
+                                    ([dict(message, clock=clock) for message in messages],)))
+        return True
+
+    def deliver(self, messages):
+        """Hand the messages of a frame that arrived to the node."""
+        for message in messages:
+            if self.running:
+                self.simulator.stats['messages_delivered'] += 1
+                self.node.process_message(message)
+
+    def spawn(self, function, *args, key=None, priority=None):
+        """
+        Run function(*args) as a separate event at the current time.
+
+        key and priority are accepted for SocketTransport compatibility;
+        events at the same time always run in the order they were scheduled.
+        """
+        self.simulator.schedule(0.0, function, *args)
+
+    def call_later(self, delay, function, *args):
+        """Run function(*args) after `delay` virtual seconds."""
+        self.simulator.schedule(delay, function, *args)
+
+    def now(self):
+        """Current virtual time in seconds."""
+        return self.simulator.time
+
+    def shutdown(self):
+        """Stop sending and receiving; messages in flight to this node are dropped."""
+        self.running = False
+
+
+def run_workload(simulator, nodes, requests_per_node, think_time=0.05, cs_duration=0.01,
+                 max_time=None):
+    """
+    Let every node enter the critical section `requests_per_node` times,
+    waiting a random (exponential) think time between its requests.
+
+    A message that fails all its retries is gone for good, and the node
+    waiting for it may never get in; max_time bounds the run for that case.
+
+    Args:
+        simulator (Simulator): Simulator the nodes were created with
+        nodes (dict): Mapping of node ID to node
+        requests_per_node (int): CS entries per node
+        think_time (float): Mean virtual seconds between a node's requests
+        cs_duration (float): Virtual seconds spent in each critical section
+        max_time (float): Stop at this virtual time even if requests are left
+
+    Returns:
+        list: IDs of the nodes still waiting for the critical section at the end
+    """
+    rng = simulator.rng
+
+    def next_request(node, remaining):
+        if node.requesting_cs or node.in_critical_section:
+            # Still busy with the previous request: check again later
+            simulator.schedule(think_time, next_request, node, remaining)
+            return
+        node.request_critical_section()
+        if remaining > 1:
+            simulator.schedule(rng.expovariate(1.0 / think_time), next_request, node, remaining - 1)
+
+    for node in nodes.values():
+        node.cs_duration = cs_duration
+        simulator.schedule(rng.expovariate(1.0 / think_time), next_request, node, requests_per_node)
+    simulator.run(until=max_time)
+    return [node_id for node_id, node in nodes.items() if node.requesting_cs]
+
+
+def simulate_test_algorithm(node_class=Node, seed=0, verbose=True, **kwargs):
+    """
+    The scenario of mutualexclusion.test_algorithm (3 nodes, 20% message
+    failures, concurrent, sequential and high-contention rounds) in virtual time.
+
+    Returns:
+        Simulator: The finished simulation, for its statistics
+    """
+    sim = Simulator(seed=seed, latency=(0.1, 0.5), loss_rate=0.2, verbose=verbose)
+    nodes = sim.create_nodes([1, 2, 3], node_class, **kwargs)
+    # Same request times as the socket-based test (in seconds after start)
+    schedule = [(1.0, 1), (1.1, 2), (1.2, 3),                       # Round 1: concurrent
+                (11.2, 3), (11.3, 1)]                               # Round 2: sequential
+    start = 19.3
+    for i in range(3):                                              # Round 3: high contention
+        schedule += [(start, 1), (start + 0.05, 2), (start + 0.1, 3)]
+        start += 2.1
+    for at, node_id in schedule:
+        sim.schedule(at, nodes[node_id].request_critical_section)
+    sim.run(until=start + 5)
+    for node in nodes.values():
+        node.print_statistics()
+    return sim
+
+
+if __name__ == "__main__":
+    from maekawa import MaekawaNode
+    from suzukikasami import SuzukiKasamiNode
+
+    started = time.perf_counter()
+    sim = simulate_test_algorithm(verbose=False)
+    print(f"\nSocket test scenario: {sim.time:.1f} virtual sec in "
+          f"{time.perf_counter() - started:.3f} sec, violations: {sim.violations}\n")
+
+    runs = [
+        ("Ricart-Agrawala", Node, 200, {'keep_permissions': False}),
+        ("Roucairol-Carvalho", Node, 200, {}),
+        ("Suzuki-Kasami", SuzukiKasamiNode, 500, {}),
+        ("Maekawa", MaekawaNode, 1000, {}),
+    ]
+    for name, node_class, count, kwargs in runs:
+        sim = Simulator(seed=1)
+        nodes = sim.create_nodes(range(1, count + 1), node_class, **kwargs)
+        started = time.perf_counter()
+        waiting = run_workload(sim, nodes, requests_per_node=2, think_time=5.0,
+                               cs_duration=0.001, max_time=60.0)
+        elapsed = time.perf_counter() - started
+        entries = sum(node.stats['cs_entries'] for node in nodes.values())
+        print(f"{name:<19} {count:>5} nodes: {entries:>5} CS entries, "
+              f"{sim.stats['messages_sent']:>8} messages, {sim.time:5.1f} virtual sec "
+              f"in {elapsed:5.2f} sec, violations: {len(sim.violations)}, "
+              f"still waiting: {len(waiting)}")
@@ -0,0 +1,209 @@
+"""
+Distributed Mutual Exclusion using the Suzuki-Kasami Algorithm
+==============================================================
+
+Token-based alternative to the Ricart-Agrawala node in mutualexclusion.py,
+with the same public API (request_critical_section, exit_critical_section,
+get_statistics). Exactly one node holds the token, and only the token holder
+may enter the critical section:
+1. A node holding the token enters without sending any message
+2. Otherwise it broadcasts REQUEST with its request number to all peers
+   (N-1 messages) and waits for the token (1 message), N messages in total
+3. On exit the holder appends every peer with an outstanding request to the
+   token queue and passes the token to the head of the queue
+
+State:
+- RN[j]: highest request number seen from node j
+- Token LN[j]: request number of node j's most recently served request
+- Token queue: nodes waiting for the token, in order
+
+REQUEST messages carry the request number in the timestamp field, so they use
+the compact binary layout of wire.py; the TOKEN with its LN array and queue
+uses the JSON fallback.
+"""
+
+import time
+
+from mutualexclusion import Node
+
+
+class SuzukiKasamiNode(Node):
+    """
+    A node in the distributed system implementing the Suzuki-Kasami algorithm.
+    """
+
+    def __init__(self, node_id, port, peers, has_token=None, transport=None):
+        """
+        Initialize a node in the distributed system.
+
+        Args:
+            node_id (int): Unique identifier for this node
+            port (int): Port number for this node's socket server
+            peers (dict): Dictionary mapping peer node IDs to their port numbers
+            has_token (bool): Whether this node starts with the token
+                              (default: the node with the lowest ID)
+            transport: Message transport (default: a SocketTransport on `port`)
+        """
+        super().__init__(node_id, port, peers, keep_permissions=False, transport=transport)
+        if has_token is None:
+            has_token = node_id < min(peers, default=node_id + 1)
+
+        # Suzuki-Kasami algorithm state variables
+        self.request_numbers = {n: 0 for n in list(peers) + [node_id]}   # RN
+        self.token = None                   # {'last_served': {id: n}, 'queue': [id, ...]} while held
+        if has_token:
+            self.token = {'last_served': {n: 0 for n in self.request_numbers}, 'queue': []}
+        self.stats['tokens_sent'] = 0
+
+    def process_message(self, message):
+        """
+        Process incoming REQUEST and TOKEN messages.
+
+        Args:
+            message (dict): REQUEST with sender_id and request number (timestamp),
+                            or TOKEN with last_served and queue
+        """
+        with self.lock:
+            if message['type'] == 'REQUEST':
+                self.log(f"Node {self.id} got REQUEST from Node {message['sender_id']}")
+                self.handle_request(message['sender_id'], message['timestamp'])
+            elif message['type'] == 'TOKEN':
+                self.log(f"Node {self.id} got TOKEN from Node {message['sender_id']}")
+                self.handle_token(message)
+
+    def handle_request(self, sender_id, request_number):
+        """
+        Record a peer's request and pass the token on if we hold it idle.
+
+        Args:
+            sender_id (int): ID of the node requesting CS access
+            request_number (int): The sender's request number
+        """
+        self.request_numbers[sender_id] = max(self.request_numbers[sender_id], request_number)
+        token = self.token
+        if (token is not None and not self.in_critical_section and not self.requesting_cs
+                and self.request_numbers[sender_id] == token['last_served'][sender_id] + 1):
+            self.send_token(sender_id)
+        elif token is not None:
+            self.stats['deferred_replies'] += 1
+
+    def handle_token(self, message):
+        """
+        Take over the token and enter the critical section if we asked for it.
+
+        Args:
+            message (dict): TOKEN message with last_served pairs and queue
+        """
+        self.token = {'last_served': {n: served for n, served in message['last_served']},
+                      'queue': list(message['queue'])}
+        if self.requesting_cs:
+            self.enter_critical_section()
+
+    def send_token(self, target_id):
+        """
+        Pass the token to another node.
+
+        Args:
+            target_id (int): ID of the node to send the token to
+        """
+        token, self.token = self.token, None
+        message = {
+            'type': 'TOKEN',
+            'sender_id': self.id,
+            'last_served': [[n, served] for n, served in token['last_served'].items()],
+            'queue': token['queue'],
+        }
+        self.stats['tokens_sent'] += 1
+        self.queue_message(target_id, message)
+
+    def request_critical_section(self):
+        """
+        Request access to the critical section.
+
+        Enters at once if this node holds the token; otherwise broadcasts a
+        REQUEST with the next request number and enters when the token arrives.
+        If already in CS or requesting CS, the request is ignored.
+        """
+        with self.lock:
+            if self.in_critical_section or self.requesting_cs:
+                return
+            self.requesting_cs = True
+            self.request_time = self.transport.now()
+
+            if self.token is not None:
+                # We hold the token: enter without any messages
+                self.stats['requests_saved'] += len(self.peers)
+                self.log(f"Node {self.id} requests CS holding the token")
+                self.enter_critical_section()
+                return
+
+            self.request_numbers[self.id] += 1
+            sequence = self.request_numbers[self.id]
+            self.log(f"Node {self.id} requests CS with request number {sequence}")
+            message = {'type': 'REQUEST', 'sender_id': self.id, 'timestamp': sequence}
+            for peer_id in self.peers:
+                self.queue_message(peer_id, message)
+
+    def exit_critical_section(self):
+        """
+        Exit the critical section and pass the token to the next waiting node.
+
+        Marks our request as served, appends every peer with an outstanding
+        request to the token queue, and sends the token to the head of the queue.
+        """
+        with self.lock:
+            self.in_critical_section = False
+            token = self.token
+            token['last_served'][self.id] = self.request_numbers[self.id]
+            for node_id in sorted(self.peers):
+                if (node_id not in token['queue']
+                        and self.request_numbers[node_id] == token['last_served'][node_id] + 1):
+                    token['queue'].append(node_id)
+            if token['queue']:
+                self.send_token(token['queue'].pop(0))
+
+    def print_statistics(self):
+        """Display the node's statistics, including tokens passed on."""
+        super().print_statistics()
+        print(f"  Tokens Sent: {self.stats['tokens_sent']}")
+
+
+def test_algorithm():
+    """
+    Run 3 Suzuki-Kasami nodes: repeated entries by the token holder, then
+    concurrent requests from all nodes.
+    """
+    print("=" * 60)
+    print("SUZUKI-KASAMI TOKEN-BASED MUTUAL EXCLUSION TEST")
+    print("=" * 60)
+
+    ports = {1: 5011, 2: 5012, 3: 5013}
+    nodes = {i: SuzukiKasamiNode(i, port, {j: p for j, p in ports.items() if j != i})
+             for i, port in ports.items()}
+    for node in nodes.values():
+        node.failure_rate = 0.0
+        node.start()
+    time.sleep(1)
+
+    print("\nRepeated entries by the token holder (no messages)...")
+    for _ in range(2):
+        nodes[1].request_critical_section()
+        time.sleep(2.5)
+
+    print("\nConcurrent requests...")
+    for node in nodes.values():
+        node.request_critical_section()
+        time.sleep(0.1)
+    time.sleep(8)
+
+    for node in nodes.values():
+        node.print_statistics()
+    for node in nodes.values():
+        node.shutdown()
+
+
+if __name__ == "__main__":
+    try:
+        test_algorithm()
+    except KeyboardInterrupt:
+        print("\nTest interrupted by user")
@@ -0,0 +1,215 @@
+"""
+Wire Protocol for Mutual-Exclusion Messages
+===========================================
+
+Framed encoding shared by SocketNode, ReliableNode and mutualexclusion.Node.
+Every message is one frame:
+
+    length (uint32, big-endian) | payload (length bytes)
+
+The length prefix lets the reader collect exactly one message no matter how
+the bytes were split by TCP, so any number of messages can be pipelined on a
+single connection.
+
+Payload formats (first payload byte):
+- BINARY: fixed struct of type code, flags, sender ID and Lamport timestamp
+  (19 bytes). Used for the common REQUEST/REPLY messages.
+- JSON: the message dictionary as UTF-8 JSON. Used for everything the binary
+  layout cannot hold (unknown types, extra fields, non-integer IDs).
+- BATCH: several messages for the same peer in one frame, with the sender's
+  Lamport clock piggybacked once for all of them:
+
+      format | clock (int64) | count (uint16) | count x (length | payload)
+
+  Each inner payload is a BINARY or JSON payload. Decoding adds the clock to
+  every message of the batch as its 'clock' field.
+
+The node variants name the sender field differently ('sender_id' in
+mutualexclusion.Node, 'from_id' in SocketNode), so encode/decode take the
+field name as sender_key.
+"""
+
+import json
+import struct
+
+FORMAT_JSON = 0
+FORMAT_BINARY = 1
+FORMAT_BATCH = 2
+
+LENGTH = struct.Struct('>I')
+BINARY = struct.Struct('>BBBqq')  # format, type code, flags, sender, timestamp
+BATCH_HEADER = struct.Struct('>BqH')  # format, clock, message count
+HAS_TIMESTAMP = 1
+MAX_FRAME_SIZE = 16 << 20
+MAX_BATCH = 0xFFFF
+
+# Message types with a binary encoding (the code is the index in this list,
+# so new types are only ever appended)
+MESSAGE_TYPES = ['REQUEST', 'REPLY', 'RELEASE', 'FAILED', 'INQUIRE', 'RELINQUISH']
+TYPE_CODES = {name: code for code, name in enumerate(MESSAGE_TYPES)}
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _fits_binary(message, sender_key):
+    if message.get('type') not in TYPE_CODES:
+        return False
+    if set(message) - {'type', sender_key, 'timestamp'}:
+        return False
+    values = [message.get(sender_key)]
+    if 'timestamp' in message:
+        values.append(message['timestamp'])
+    # bool is an int subclass but would not survive the round trip
+    return all(type(v) is int and INT64_MIN <= v <= INT64_MAX for v in values)
+
+
+def encode_payload(message, sender_key='sender_id'):
+    """
+    Encode a message dictionary without the length prefix.
+
+    Args:
+        message (dict): Message with at least a 'type' field
+        sender_key (str): Name of the sender ID field
+
+    Returns:
+        bytes: Binary payload if the message fits the fixed layout, JSON otherwise
+    """
+    if _fits_binary(message, sender_key):
+        flags = HAS_TIMESTAMP if 'timestamp' in message else 0
+        return BINARY.pack(FORMAT_BINARY, TYPE_CODES[message['type']], flags,
+                           message[sender_key], message.get('timestamp', 0))
+    return bytes([FORMAT_JSON]) + json.dumps(message).encode('utf-8')
+
+
+def decode_payload(payload, sender_key='sender_id'):
+    """
+    Decode a payload produced by encode_payload().
+
+    Args:
+        payload (bytes): Frame payload (without the length prefix)
+        sender_key (str): Name of the sender ID field
+
+    Returns:
+        dict: The message dictionary
+    """
+    if not payload:
+        raise ValueError("Empty frame")
+    if payload[0] == FORMAT_BINARY:
+        _, code, flags, sender, timestamp = BINARY.unpack(payload)
+        message = {'type': MESSAGE_TYPES[code], sender_key: sender}
+        if flags & HAS_TIMESTAMP:
+            message['timestamp'] = timestamp
+        return message
+    if payload[0] == FORMAT_JSON:
+        return json.loads(payload[1:].decode('utf-8'))
+    raise ValueError(f"Unknown payload format {payload[0]}")
+
+
+def encode(message, sender_key='sender_id'):
+    """
+    Encode a message dictionary as one complete frame.
+
+    Returns:
+        bytes: Length prefix followed by the payload
+    """
+    payload = encode_payload(message, sender_key)
+    return LENGTH.pack(len(payload)) + payload
+
+
+def encode_batch(messages, clock, sender_key='sender_id'):
+    """
+    Encode several messages for one peer as a single BATCH frame.
+
+    Args:
+        messages (list): Message dictionaries, decoded in this order
+        clock (int): Sender's Lamport clock, piggybacked on the batch
+        sender_key (str): Name of the sender ID field
+
+    Returns:
+        bytes: Length prefix followed by the batch payload
+    """
+    if len(messages) > MAX_BATCH:
+        raise ValueError(f"A batch holds at most {MAX_BATCH} messages")
+    parts = [BATCH_HEADER.pack(FORMAT_BATCH, clock, len(messages))]
+    for message in messages:
+        payload = encode_payload(message, sender_key)
+        parts.append(LENGTH.pack(len(payload)))
+        parts.append(payload)
+    body = b''.join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+def decode_messages(payload, sender_key='sender_id'):
+    """
+    Decode a frame payload that may hold a batch.
+
+    Args:
+        payload (bytes): Frame payload (without the length prefix)
+        sender_key (str): Name of the sender ID field
+
+    Returns:
+        list: The message dictionaries; messages from a batch carry its
+              Lamport clock as 'clock'
+    """
+    if not payload or payload[0] != FORMAT_BATCH:
+        return [decode_payload(payload, sender_key)]
+    _, clock, count = BATCH_HEADER.unpack_from(payload)
+    offset = BATCH_HEADER.size
+    messages = []
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(payload, offset)
+        offset += LENGTH.size
+        if offset + length > len(payload):
+            raise ValueError("Batch message runs past the end of the frame")
+        message = decode_payload(payload[offset:offset + length], sender_key)
+        message['clock'] = clock
+        messages.append(message)
+        offset += length
+    if offset != len(payload):
+        raise ValueError("Unexpected bytes after the last batch message")
+    return messages
+
+
+def read_frame(stream):
+    """
+    Read one frame payload from a buffered binary stream.
+
+    Args:
+        stream: File-like object, e.g. sock.makefile('rb'), whose read(n) only
+                returns fewer than n bytes at end of stream
+
+    Returns:
+        bytes: The payload, or None if the stream ended between frames
+    """
+    header = stream.read(LENGTH.size)
+    if not header:
+        return None
+    if len(header) < LENGTH.size:
+        raise ConnectionError("Connection closed inside a frame header")
+    (length,) = LENGTH.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the maximum frame size")
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ConnectionError("Connection closed inside a frame")
+    return payload
+
+
+def read_messages(sock, sender_key='sender_id'):
+    """
+    Read framed messages from a connected socket until the peer closes it.
+
+    Args:
+        sock (socket.socket): Connection to read from
+        sender_key (str): Name of the sender ID field
+
+    Yields:
+        dict: Each decoded message, in the order it was sent (batches are
+              unpacked into their messages)
+    """
+    with sock.makefile('rb') as stream:
+        while True:
+            payload = read_frame(stream)
+            if payload is None:
+                return
+            yield from decode_messages(payload, sender_key)